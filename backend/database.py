@@ -1,13 +1,95 @@
-from sqlalchemy import text
+import logging
+import os
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.pool import QueuePool
 from sqlmodel import Session, SQLModel, create_engine
 
-DATABASE_URL = "sqlite:///gaindalf.db"
+logger = logging.getLogger(__name__)
+
+# GAINDALF_DB=/dev/shm/gaindalf.db keeps the database in RAM (e.g. for CI or benchmarks).
+DATABASE_PATH = os.environ.get("GAINDALF_DB", "gaindalf.db")
+# Per-connection settings — most PRAGMAs only apply to the connection that runs them,
+# so they are set on every new DBAPI connection the pools open.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+]
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _disable_pysqlite_transactions(dbapi_connection, connection_record) -> None:
+    # pysqlite defers BEGIN until the first DML statement; hand transaction control
+    # to SQLAlchemy so the "begin" hook below decides how transactions start.
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn) -> None:
+    # Take the write lock up front instead of upgrading from a read lock mid-transaction,
+    # which is where SQLITE_BUSY errors come from under concurrency.
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_engines(database_path: str) -> tuple[Engine, Engine]:
+    """Build the (write, read) engine pair for the database file at ``database_path``.
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    One writer, many readers: SQLite allows a single write lock at a time, so writes are
+    serialized through a one-connection pool while read-only connections serve GETs
+    concurrently under WAL. Connections stay open between requests so each one's page
+    cache stays warm.
+    """
+    write_engine = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_recycle=3600,
+        pool_pre_ping=False,
+        pool_reset_on_return=None,
+    )
+    read_engine = create_engine(
+        f"sqlite:///file:{database_path}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=8,
+        max_overflow=16,
+        pool_recycle=3600,
+        pool_pre_ping=False,
+        pool_reset_on_return=None,
+    )
+    for engine in (write_engine, read_engine):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(write_engine, "connect", _disable_pysqlite_transactions)
+    event.listen(write_engine, "begin", _begin_immediate)
+    return write_engine, read_engine
 
-# Enable WAL mode for better read performance
-with engine.connect() as _conn:
-    _conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+write_engine, read_engine = create_engines(DATABASE_PATH)
+
+
+def outdated_foreign_key_tables(conn) -> list[str]:
+    """Tables whose foreign keys in the database lack their model's ON DELETE action."""
+    outdated = []
+    for table in SQLModel.metadata.sorted_tables:
+        rows = conn.exec_driver_sql(f"PRAGMA foreign_key_list({table.name})").fetchall()
+        current = {row[3]: row[6] for row in rows}
+        expected = {fk.parent.name: fk.ondelete or "NO ACTION" for fk in table.foreign_keys}
+        if current != expected:
+            outdated.append(table.name)
+    return outdated
 
 
 def _run_migrations(engine) -> None:
@@ -21,13 +103,44 @@ def _run_migrations(engine) -> None:
                 conn.commit()
             except Exception:
                 pass  # column already exists
+        # create_all skips tables that already exist, indexes included.
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        conn.commit()
+        outdated = outdated_foreign_key_tables(conn)
+    if outdated:
+        # Rebuilding tables is a one-off step with a backup, so it never runs at startup
+        logger.warning(
+            "Foreign keys on %s don't match the models; deletes relying on ON DELETE "
+            "CASCADE will fail. Run `just migrate-foreign-keys` to back up and rebuild them.",
+            ", ".join(outdated),
+        )
 
 
 def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
-    _run_migrations(engine)
+    SQLModel.metadata.create_all(write_engine)
+    _run_migrations(write_engine)
+
+
+def checkpoint_wal() -> None:
+    """Copy the WAL back into the database file and truncate it to zero bytes.
+
+    Autocheckpoints never shrink the -wal file, and they can't finish while readers are
+    still using old frames, so the file keeps growing under steady read traffic.
+    """
+    dbapi_connection = write_engine.raw_connection()
+    try:
+        dbapi_connection.cursor().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        dbapi_connection.close()
+
+
+def get_read_session():
+    with Session(read_engine) as session:
+        yield session
 
 
-def get_session():
-    with Session(engine) as session:
+def get_write_session():
+    with Session(write_engine) as session:
         yield session
@@ -1,21 +1,74 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import os
+import re
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
+from sqlmodel import Session
 
 import backend.models as _models  # noqa: F401 — registers tables with SQLModel metadata
-from backend.database import create_db_and_tables
+from backend.database import checkpoint_wal, create_db_and_tables, write_engine
 from backend.routers import analytics, lifts, muscle_groups, sets, settings, workouts
+from backend.services.indexes import refresh_workout_indexes_cache
+
+logger = logging.getLogger(__name__)
+
+# Names like app.3f9a1c2e.js change whenever their content does, so they can be cached forever.
+_FINGERPRINTED = re.compile(r"\.[0-9a-f]{8,}\.(js|css)$")
+
+
+class FrontendFiles(StaticFiles):
+    """StaticFiles with Cache-Control headers.
+
+    Unfingerprinted files are marked ``no-cache`` so the browser revalidates them with the
+    ETag StaticFiles already sends, getting a 304 instead of the body when nothing changed.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _FINGERPRINTED.search(str(full_path)):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+WAL_CHECKPOINT_INTERVAL = 300  # seconds
+
+
+async def _checkpoint_wal_periodically() -> None:
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+        try:
+            # Waits for the single write connection, so keep it off the event loop
+            await asyncio.to_thread(checkpoint_wal)
+        except Exception:
+            # A busy write pool shouldn't stop checkpoints for the rest of the process
+            logger.exception(
+                "WAL checkpoint failed; retrying in %s seconds", WAL_CHECKPOINT_INTERVAL
+            )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    # Backfill indexes for workouts written before the cache existed or outside the API
+    with Session(write_engine) as session:
+        refresh_workout_indexes_cache(session)
+        session.commit()
+    checkpointer = asyncio.create_task(_checkpoint_wal_periodically())
     yield
+    checkpointer.cancel()
+    with suppress(asyncio.CancelledError):
+        await checkpointer
 
 
 app = FastAPI(title="Gaindalf", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=6)
 
 app.include_router(muscle_groups.router, prefix="/api/muscle-groups", tags=["muscle-groups"])
 app.include_router(lifts.router, prefix="/api/lifts", tags=["lifts"])
@@ -25,9 +78,11 @@ app.include_router(settings.router, prefix="/api/settings", tags=["settings"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
 # Serve frontend static files
-app.mount("/static", StaticFiles(directory="frontend", html=True), name="static")
+frontend_files = FrontendFiles(directory="frontend", html=True)
+app.mount("/static", frontend_files, name="static")
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
-async def serve_spa():
-    return FileResponse("frontend/index.html")
+async def serve_spa(request: Request):
+    index_path = "frontend/index.html"
+    return frontend_files.file_response(index_path, os.stat(index_path), request.scope)
@@ -0,0 +1,95 @@
+"""
+Rebuild tables whose foreign keys predate their model's ON DELETE action.
+Run with: just migrate-foreign-keys
+
+SQLite can't alter a constraint in place, so each outdated table is renamed, recreated
+from its model and refilled with every one of its rows. The database file is backed up
+first.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import SQLModel
+
+import backend.models as _models  # noqa: F401 — registers tables with SQLModel metadata
+from backend.database import DATABASE_PATH, outdated_foreign_key_tables, write_engine
+
+
+def backup() -> Path:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    dest = Path(DATABASE_PATH).with_name(f"gaindalf-backup-{stamp}.db")
+    source = sqlite3.connect(DATABASE_PATH)
+    target = sqlite3.connect(dest)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return dest
+
+
+def rebuild_foreign_keys() -> list[str]:
+    with write_engine.connect() as conn:
+        outdated = outdated_foreign_key_tables(conn)
+    if not outdated:
+        return []
+
+    dbapi_connection = write_engine.raw_connection()
+    cursor = dbapi_connection.cursor()
+    # Both PRAGMAs are no-ops inside a transaction; legacy_alter_table keeps other tables'
+    # foreign keys pointing at the original name while the table is swapped out. With
+    # foreign keys off, rows whose parent is already gone are copied over unchanged.
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    cursor.execute("PRAGMA legacy_alter_table=ON")
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name not in outdated:
+                continue
+
+            # Triggers are dropped along with the old table, so save their DDL first
+            triggers = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?",
+                (table.name,),
+            ).fetchall()
+
+            old_name = f"_{table.name}_old"
+            cursor.execute(f"ALTER TABLE {table.name} RENAME TO {old_name}")
+            old_indexes = cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                "AND sql IS NOT NULL",
+                (old_name,),
+            ).fetchall()
+            for (index_name,) in old_indexes:
+                cursor.execute(f"DROP INDEX {index_name}")
+
+            cursor.execute(str(CreateTable(table).compile(dialect=write_engine.dialect)))
+            for index in table.indexes:
+                cursor.execute(str(CreateIndex(index).compile(dialect=write_engine.dialect)))
+
+            columns = ", ".join(column.name for column in table.columns)
+            cursor.execute(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}")
+            cursor.execute(f"DROP TABLE {old_name}")
+            for (trigger_sql,) in triggers:
+                cursor.execute(trigger_sql)
+        cursor.execute("COMMIT")
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+    finally:
+        cursor.execute("PRAGMA legacy_alter_table=OFF")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+        dbapi_connection.close()
+    return outdated
+
+
+if __name__ == "__main__":
+    if not Path(DATABASE_PATH).exists():
+        raise SystemExit(f"No database at {DATABASE_PATH}")
+    print(f"Backed up to {backup()}")
+    rebuilt = rebuild_foreign_keys()
+    print(f"Rebuilt {', '.join(rebuilt)}." if rebuilt else "Foreign keys already up to date.")
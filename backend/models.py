@@ -1,6 +1,7 @@
 from datetime import date
 
-from sqlmodel import Field, SQLModel
+from sqlalchemy import Index, event
+from sqlmodel import Field, Relationship, SQLModel
 
 
 class MuscleGroup(SQLModel, table=True):
@@ -8,33 +9,63 @@ class MuscleGroup(SQLModel, table=True):
     name: str = Field(index=True, unique=True)
 
 
+class LiftMuscleGroup(SQLModel, table=True):
+    lift_id: int = Field(foreign_key="lift.id", primary_key=True, ondelete="CASCADE")
+    muscle_group_id: int = Field(
+        foreign_key="musclegroup.id", primary_key=True, ondelete="CASCADE", index=True
+    )
+
+
 class Lift(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
 
-
-class LiftMuscleGroup(SQLModel, table=True):
-    lift_id: int = Field(foreign_key="lift.id", primary_key=True)
-    muscle_group_id: int = Field(foreign_key="musclegroup.id", primary_key=True)
+    muscle_groups: list[MuscleGroup] = Relationship(
+        link_model=LiftMuscleGroup,
+        passive_deletes=True,
+        sa_relationship_kwargs={"order_by": "MuscleGroup.id"},
+    )
 
 
 class Workout(SQLModel, table=True):
+    # Declared here rather than as Field(index=True): a default would shadow the date type.
+    __table_args__ = (Index("ix_workout_date", "date"),)
+
     id: int | None = Field(default=None, primary_key=True)
     date: date
     subtitle: str = ""
 
+    workout_lifts: list["WorkoutLift"] = Relationship(
+        cascade_delete=True,
+        passive_deletes=True,
+        sa_relationship_kwargs={"order_by": "WorkoutLift.id"},
+    )
+
 
 class WorkoutLift(SQLModel, table=True):
+    __table_args__ = (Index("ix_workoutlift_lift_id_workout_id", "lift_id", "workout_id"),)
+
     id: int | None = Field(default=None, primary_key=True)
-    workout_id: int = Field(foreign_key="workout.id")
+    workout_id: int = Field(foreign_key="workout.id", ondelete="CASCADE", index=True)
     lift_id: int = Field(foreign_key="lift.id")
     display_order: int = 0
     notes: str = Field(default="")
 
+    lift: Lift | None = Relationship()
+    sets: list["WorkoutSet"] = Relationship(
+        cascade_delete=True,
+        passive_deletes=True,
+        sa_relationship_kwargs={"order_by": "WorkoutSet.id"},
+    )
+
 
 class WorkoutSet(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_workoutset_workout_lift_id_set_number", "workout_lift_id", "set_number"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
-    workout_lift_id: int = Field(foreign_key="workoutlift.id")
+    workout_lift_id: int = Field(foreign_key="workoutlift.id", ondelete="CASCADE")
     set_number: int
     reps: int | None = None
     weight: float | None = None  # stored in kg
@@ -43,5 +74,87 @@ class WorkoutSet(SQLModel, table=True):
 
 class MuscleGroupConflict(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    muscle_group_a_id: int = Field(foreign_key="musclegroup.id")
-    muscle_group_b_id: int = Field(foreign_key="musclegroup.id")
+    muscle_group_a_id: int = Field(foreign_key="musclegroup.id", ondelete="CASCADE", index=True)
+    muscle_group_b_id: int = Field(foreign_key="musclegroup.id", ondelete="CASCADE", index=True)
+
+
+class WorkoutIndexesCache(SQLModel, table=True):
+    """Materialized output of ``calculate_workout_indexes``, one row per workout.
+
+    Rows are dropped by the triggers below whenever the data behind them changes, and
+    refilled by ``refresh_workout_indexes_cache`` before write transactions commit.
+    """
+
+    workout_id: int = Field(foreign_key="workout.id", primary_key=True, ondelete="CASCADE")
+    strength_index: float | None = None
+    endurance_index: float | None = None
+
+
+# A lift's first appearance is the baseline every later appearance is compared against, so
+# a change to a baseline invalidates all workouts with that lift; any other change only
+# invalidates its own workout.
+_INVALIDATE_WORKOUT_LIFT = """
+    DELETE FROM workoutindexescache WHERE workout_id IN (
+        SELECT other.workout_id FROM workoutlift AS changed
+        JOIN workoutlift AS other ON other.lift_id = changed.lift_id
+        WHERE changed.id = {wl_id} AND (other.id = changed.id OR changed.id = (
+            SELECT wl.id FROM workoutlift AS wl JOIN workout ON workout.id = wl.workout_id
+            WHERE wl.lift_id = changed.lift_id ORDER BY workout.date, wl.id LIMIT 1
+        ))
+    );
+"""
+_INVALIDATE_LIFT = """
+    DELETE FROM workoutindexescache
+    WHERE workout_id IN (SELECT workout_id FROM workoutlift WHERE lift_id = {lift_id});
+"""
+
+WORKOUT_INDEXES_CACHE_TRIGGERS = {
+    "workoutset_insert": (
+        "AFTER INSERT ON workoutset",
+        _INVALIDATE_WORKOUT_LIFT.format(wl_id="NEW.workout_lift_id"),
+    ),
+    "workoutset_update": (
+        "AFTER UPDATE OF reps, weight, workout_lift_id ON workoutset",
+        _INVALIDATE_WORKOUT_LIFT.format(wl_id="OLD.workout_lift_id")
+        + _INVALIDATE_WORKOUT_LIFT.format(wl_id="NEW.workout_lift_id"),
+    ),
+    # When the set goes with its workout lift, the workoutlift trigger already covers it
+    "workoutset_delete": (
+        "AFTER DELETE ON workoutset",
+        _INVALIDATE_WORKOUT_LIFT.format(wl_id="OLD.workout_lift_id"),
+    ),
+    "workoutlift_insert": (
+        "AFTER INSERT ON workoutlift",
+        _INVALIDATE_WORKOUT_LIFT.format(wl_id="NEW.id"),
+    ),
+    # The removed row may have been the baseline; its workout no longer joins to it
+    "workoutlift_delete": (
+        "AFTER DELETE ON workoutlift",
+        "DELETE FROM workoutindexescache WHERE workout_id = OLD.workout_id;"
+        + _INVALIDATE_LIFT.format(lift_id="OLD.lift_id"),
+    ),
+    "workoutlift_update": (
+        "AFTER UPDATE OF lift_id, workout_id ON workoutlift",
+        "DELETE FROM workoutindexescache WHERE workout_id = OLD.workout_id;"
+        + _INVALIDATE_LIFT.format(lift_id="OLD.lift_id")
+        + _INVALIDATE_LIFT.format(lift_id="NEW.lift_id"),
+    ),
+    "workout_update": (
+        "AFTER UPDATE OF date ON workout",
+        """
+        DELETE FROM workoutindexescache WHERE workout_id IN (
+            SELECT other.workout_id FROM workoutlift AS moved
+            JOIN workoutlift AS other ON other.lift_id = moved.lift_id
+            WHERE moved.workout_id = NEW.id
+        );
+        """,
+    ),
+}
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_workout_indexes_cache_triggers(target, connection, **kw) -> None:
+    for name, (timing, body) in WORKOUT_INDEXES_CACHE_TRIGGERS.items():
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS invalidate_indexes_on_{name} {timing} BEGIN {body} END"
+        )
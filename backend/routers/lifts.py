@@ -2,14 +2,16 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, SQLModel, select
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import Session, SQLModel, delete, select
 
-from backend.database import get_session
-from backend.models import Lift, LiftMuscleGroup, MuscleGroup
+from backend.database import get_read_session, get_write_session
+from backend.models import Lift, LiftMuscleGroup, MuscleGroup, Workout, WorkoutLift, WorkoutSet
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_session)]
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
 
 
 class LiftRead(SQLModel):
@@ -28,105 +30,106 @@ class LiftUpdate(SQLModel):
     muscle_group_ids: list[int] | None = None
 
 
-def _muscle_group_ids_for_lift(session: Session, lift_id: int) -> list[int]:
-    rows = session.exec(select(LiftMuscleGroup).where(LiftMuscleGroup.lift_id == lift_id)).all()
-    return [row.muscle_group_id for row in rows]
+def _lift_read(lift: Lift) -> LiftRead:
+    return LiftRead(
+        id=lift.id,
+        name=lift.name,
+        muscle_group_ids=[mg.id for mg in lift.muscle_groups],
+    )
 
 
 def _verify_muscle_groups_exist(session: Session, muscle_group_ids: list[int]) -> None:
-    for mg_id in muscle_group_ids:
-        if session.get(MuscleGroup, mg_id) is None:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Muscle group with id {mg_id} does not exist",
-            )
+    if not muscle_group_ids:
+        return
+    found = set(
+        session.exec(select(MuscleGroup.id).where(MuscleGroup.id.in_(muscle_group_ids))).all()
+    )
+    missing = sorted(set(muscle_group_ids) - found)
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Muscle group ids do not exist: {missing}",
+        )
+
+
+_LIST_LIFTS = select(Lift).options(selectinload(Lift.muscle_groups), raiseload("*"))
 
 
 @router.get("", response_model=list[LiftRead])
-def list_lifts(session: SessionDep):
-    lifts = session.exec(select(Lift)).all()
-    return [
-        LiftRead(
-            id=lift.id,
-            name=lift.name,
-            muscle_group_ids=_muscle_group_ids_for_lift(session, lift.id),
-        )
-        for lift in lifts
-    ]
+def list_lifts(session: ReadSessionDep):
+    lifts = session.exec(_LIST_LIFTS).all()
+    return [_lift_read(lift) for lift in lifts]
 
 
 @router.post("", response_model=LiftRead, status_code=201)
-def create_lift(body: LiftCreate, session: SessionDep):
+def create_lift(body: LiftCreate, session: WriteSessionDep):
     _verify_muscle_groups_exist(session, body.muscle_group_ids)
 
     lift = Lift(name=body.name)
     session.add(lift)
     try:
-        session.commit()
+        session.flush()  # assigns lift.id for the links; commit once below
     except IntegrityError:
         session.rollback()
         raise HTTPException(status_code=400, detail="Name already exists")
-    session.refresh(lift)
 
-    for mg_id in body.muscle_group_ids:
-        link = LiftMuscleGroup(lift_id=lift.id, muscle_group_id=mg_id)
-        session.add(link)
+    # A repeated id would collide on the link's primary key at commit
+    session.add_all(
+        [
+            LiftMuscleGroup(lift_id=lift.id, muscle_group_id=mg_id)
+            for mg_id in dict.fromkeys(body.muscle_group_ids)
+        ]
+    )
     session.commit()
 
-    return LiftRead(
-        id=lift.id,
-        name=lift.name,
-        muscle_group_ids=_muscle_group_ids_for_lift(session, lift.id),
-    )
+    return _lift_read(lift)
 
 
 @router.patch("/{id}", response_model=LiftRead)
-def update_lift(id: int, body: LiftUpdate, session: SessionDep):
+def update_lift(id: int, body: LiftUpdate, session: WriteSessionDep):
     lift = session.get(Lift, id)
     if lift is None:
         raise HTTPException(status_code=404, detail="Lift not found")
 
+    if body.muscle_group_ids is not None:
+        _verify_muscle_groups_exist(session, body.muscle_group_ids)
+
+    # Flush the steps and commit once, so a failed update leaves the lift untouched
     if body.name is not None:
         lift.name = body.name
         session.add(lift)
         try:
-            session.commit()
+            session.flush()
         except IntegrityError:
             session.rollback()
             raise HTTPException(status_code=400, detail="Name already exists")
-        session.refresh(lift)
 
     if body.muscle_group_ids is not None:
-        _verify_muscle_groups_exist(session, body.muscle_group_ids)
-
-        existing = session.exec(select(LiftMuscleGroup).where(LiftMuscleGroup.lift_id == id)).all()
-        for row in existing:
-            session.delete(row)
-        session.commit()
+        session.exec(delete(LiftMuscleGroup).where(LiftMuscleGroup.lift_id == id))
+        session.add_all(
+            [
+                LiftMuscleGroup(lift_id=id, muscle_group_id=mg_id)
+                for mg_id in dict.fromkeys(body.muscle_group_ids)
+            ]
+        )
 
-        for mg_id in body.muscle_group_ids:
-            link = LiftMuscleGroup(lift_id=lift.id, muscle_group_id=mg_id)
-            session.add(link)
-        session.commit()
+    session.commit()
 
-    return LiftRead(
-        id=lift.id,
-        name=lift.name,
-        muscle_group_ids=_muscle_group_ids_for_lift(session, lift.id),
-    )
+    return _lift_read(lift)
 
 
 @router.delete("/{id}", status_code=204)
-def delete_lift(id: int, session: SessionDep):
+def delete_lift(id: int, session: WriteSessionDep):
     lift = session.get(Lift, id)
     if lift is None:
         raise HTTPException(status_code=404, detail="Lift not found")
 
-    existing = session.exec(select(LiftMuscleGroup).where(LiftMuscleGroup.lift_id == id)).all()
-    for row in existing:
-        session.delete(row)
-    session.commit()
+    # Workout history is kept, so a lift that has any can't be deleted
+    has_history = session.exec(select(WorkoutLift.id).where(WorkoutLift.lift_id == id).limit(1))
+    if has_history.first() is not None:
+        raise HTTPException(status_code=409, detail="Lift has workout history")
 
+    # Muscle group links go with it via ON DELETE CASCADE
     session.delete(lift)
     session.commit()
 
@@ -138,24 +141,22 @@ class PreviousSetRead(SQLModel):
 
 
 @router.get("/{lift_id}/last-sets", response_model=list[PreviousSetRead])
-def get_last_sets(lift_id: int, session: SessionDep):
+def get_last_sets(lift_id: int, session: ReadSessionDep):
     """Return the sets from the most recent workout containing this lift."""
-    from backend.models import Workout, WorkoutLift, WorkoutSet
-
-    result = session.exec(
-        select(WorkoutLift)
+    latest_workout_lift_id = (
+        select(WorkoutLift.id)
         .join(Workout, WorkoutLift.workout_id == Workout.id)
         .where(WorkoutLift.lift_id == lift_id)
         .order_by(Workout.date.desc(), WorkoutLift.id.desc())
-    ).first()
-
-    if result is None:
-        return []
-
-    sets = session.exec(
-        select(WorkoutSet)
-        .where(WorkoutSet.workout_lift_id == result.id)
-        .order_by(WorkoutSet.set_number)
-    ).all()
-
-    return [PreviousSetRead(set_number=s.set_number, reps=s.reps, weight=s.weight) for s in sets]
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        session.exec(
+            select(WorkoutSet.set_number, WorkoutSet.reps, WorkoutSet.weight)
+            .where(WorkoutSet.workout_lift_id == latest_workout_lift_id)
+            .order_by(WorkoutSet.set_number)
+        )
+        .mappings()
+        .all()
+    )
@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, SQLModel, select
 
-from backend.database import get_session
+from backend.database import get_read_session, get_write_session
 from backend.models import MuscleGroup
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_session)]
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
 
 
 class MuscleGroupCreate(SQLModel):
@@ -21,13 +22,16 @@ class MuscleGroupRead(SQLModel):
     name: str
 
 
+_LIST_MUSCLE_GROUPS = select(MuscleGroup)
+
+
 @router.get("", response_model=list[MuscleGroupRead])
-def list_muscle_groups(session: SessionDep):
-    return session.exec(select(MuscleGroup)).all()
+def list_muscle_groups(session: ReadSessionDep):
+    return session.exec(_LIST_MUSCLE_GROUPS).all()
 
 
 @router.post("", response_model=MuscleGroupRead, status_code=201)
-def create_muscle_group(body: MuscleGroupCreate, session: SessionDep):
+def create_muscle_group(body: MuscleGroupCreate, session: WriteSessionDep):
     muscle_group = MuscleGroup(name=body.name)
     session.add(muscle_group)
     try:
@@ -40,7 +44,7 @@ def create_muscle_group(body: MuscleGroupCreate, session: SessionDep):
 
 
 @router.patch("/{id}", response_model=MuscleGroupRead)
-def rename_muscle_group(id: int, body: MuscleGroupCreate, session: SessionDep):
+def rename_muscle_group(id: int, body: MuscleGroupCreate, session: WriteSessionDep):
     muscle_group = session.get(MuscleGroup, id)
     if muscle_group is None:
         raise HTTPException(status_code=404, detail="Muscle group not found")
@@ -56,9 +60,11 @@ def rename_muscle_group(id: int, body: MuscleGroupCreate, session: SessionDep):
 
 
 @router.delete("/{id}", status_code=204)
-def delete_muscle_group(id: int, session: SessionDep):
+def delete_muscle_group(id: int, session: WriteSessionDep):
     muscle_group = session.get(MuscleGroup, id)
     if muscle_group is None:
         raise HTTPException(status_code=404, detail="Muscle group not found")
+
+    # Lift links and conflicts referencing the group go with it via ON DELETE CASCADE
     session.delete(muscle_group)
     session.commit()
@@ -1,14 +1,15 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, SQLModel, select
+from sqlmodel import Session, SQLModel, func, select
 
-from backend.database import get_session
+from backend.database import get_write_session
 from backend.models import WorkoutLift, WorkoutSet
+from backend.services.indexes import refresh_workout_indexes_cache
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
 
 
 class SetRead(SQLModel):
@@ -31,12 +32,17 @@ class SetUpdate(SQLModel):
 
 
 @router.post("/workout-lifts/{wl_id}/sets", response_model=SetRead, status_code=201)
-def add_set(wl_id: int, body: SetCreate, session: SessionDep):
+def add_set(wl_id: int, body: SetCreate, session: WriteSessionDep):
     if session.get(WorkoutLift, wl_id) is None:
         raise HTTPException(status_code=404, detail="WorkoutLift not found")
 
-    existing = session.exec(select(WorkoutSet).where(WorkoutSet.workout_lift_id == wl_id)).all()
-    set_number = len(existing) + 1
+    # MAX rather than COUNT so deleting a set in the middle doesn't reuse a number.
+    last_number = session.exec(
+        select(func.coalesce(func.max(WorkoutSet.set_number), 0)).where(
+            WorkoutSet.workout_lift_id == wl_id
+        )
+    ).one()
+    set_number = last_number + 1
 
     workout_set = WorkoutSet(
         workout_lift_id=wl_id,
@@ -45,13 +51,14 @@ def add_set(wl_id: int, body: SetCreate, session: SessionDep):
         weight=body.weight,
     )
     session.add(workout_set)
+    refresh_workout_indexes_cache(session)
     session.commit()
     session.refresh(workout_set)
     return workout_set
 
 
 @router.patch("/sets/{set_id}", response_model=SetRead)
-def update_set(set_id: int, body: SetUpdate, session: SessionDep):
+def update_set(set_id: int, body: SetUpdate, session: WriteSessionDep):
     workout_set = session.get(WorkoutSet, set_id)
     if workout_set is None:
         raise HTTPException(status_code=404, detail="Set not found")
@@ -64,16 +71,18 @@ def update_set(set_id: int, body: SetUpdate, session: SessionDep):
         workout_set.done = body.done
 
     session.add(workout_set)
+    refresh_workout_indexes_cache(session)
     session.commit()
     session.refresh(workout_set)
     return workout_set
 
 
 @router.delete("/sets/{set_id}", status_code=204)
-def delete_set(set_id: int, session: SessionDep):
+def delete_set(set_id: int, session: WriteSessionDep):
     workout_set = session.get(WorkoutSet, set_id)
     if workout_set is None:
         raise HTTPException(status_code=404, detail="Set not found")
 
     session.delete(workout_set)
+    refresh_workout_indexes_cache(session)
     session.commit()
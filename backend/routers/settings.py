@@ -1,14 +1,16 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, SQLModel, and_, or_, select
 
-from backend.database import get_session
+from backend.database import get_read_session, get_write_session
 from backend.models import MuscleGroup, MuscleGroupConflict
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_session)]
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
 
 
 class ConflictRead(SQLModel):
@@ -24,27 +26,30 @@ class ConflictCreate(SQLModel):
     muscle_group_b_id: int
 
 
+_mg_a = aliased(MuscleGroup)
+_mg_b = aliased(MuscleGroup)
+# Selects exactly ConflictRead's columns so rows serialize without building ORM objects
+_LIST_CONFLICTS = (
+    select(
+        MuscleGroupConflict.id,
+        MuscleGroupConflict.muscle_group_a_id,
+        _mg_a.name.label("muscle_group_a_name"),
+        MuscleGroupConflict.muscle_group_b_id,
+        _mg_b.name.label("muscle_group_b_name"),
+    )
+    .join(_mg_a, MuscleGroupConflict.muscle_group_a_id == _mg_a.id)
+    .join(_mg_b, MuscleGroupConflict.muscle_group_b_id == _mg_b.id)
+    .order_by(MuscleGroupConflict.id)
+)
+
+
 @router.get("/conflicts", response_model=list[ConflictRead])
-def list_conflicts(session: SessionDep):
-    conflicts = session.exec(select(MuscleGroupConflict)).all()
-    result = []
-    for conflict in conflicts:
-        mg_a = session.get(MuscleGroup, conflict.muscle_group_a_id)
-        mg_b = session.get(MuscleGroup, conflict.muscle_group_b_id)
-        result.append(
-            ConflictRead(
-                id=conflict.id,
-                muscle_group_a_id=conflict.muscle_group_a_id,
-                muscle_group_a_name=mg_a.name,
-                muscle_group_b_id=conflict.muscle_group_b_id,
-                muscle_group_b_name=mg_b.name,
-            )
-        )
-    return result
+def list_conflicts(session: ReadSessionDep):
+    return session.exec(_LIST_CONFLICTS).mappings().all()
 
 
 @router.post("/conflicts", response_model=ConflictRead, status_code=201)
-def create_conflict(body: ConflictCreate, session: SessionDep):
+def create_conflict(body: ConflictCreate, session: WriteSessionDep):
     a_id = body.muscle_group_a_id
     b_id = body.muscle_group_b_id
 
@@ -92,7 +97,7 @@ def create_conflict(body: ConflictCreate, session: SessionDep):
 
 
 @router.delete("/conflicts/{conflict_id}", status_code=204)
-def delete_conflict(conflict_id: int, session: SessionDep):
+def delete_conflict(conflict_id: int, session: WriteSessionDep):
     conflict = session.get(MuscleGroupConflict, conflict_id)
     if conflict is None:
         raise HTTPException(status_code=404, detail="Conflict not found")
@@ -2,14 +2,18 @@ from datetime import date
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import raiseload, selectinload
 from sqlmodel import Session, SQLModel, select
 
-from backend.database import get_session
-from backend.models import Lift, Workout, WorkoutLift, WorkoutSet
+from backend.database import get_read_session, get_write_session
+from backend.models import Lift, Workout, WorkoutLift
+from backend.services.algorithm import suggest_lift
+from backend.services.indexes import refresh_workout_indexes_cache
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_session)]
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
 
 
 # ---------------------------------------------------------------------------
@@ -37,14 +41,14 @@ class WorkoutLiftRead(SQLModel):
 
 class WorkoutRead(SQLModel):
     id: int
-    date: str  # ISO format
+    date: date
     subtitle: str
     workout_lifts: list[WorkoutLiftRead]
 
 
 class WorkoutSummary(SQLModel):
     id: int
-    date: str  # ISO format
+    date: date
     subtitle: str
     lift_names: list[str]
 
@@ -73,123 +77,92 @@ class WorkoutLiftUpdate(SQLModel):
 
 
 def _get_previous_notes(lift_id: int, current_wl_id: int, session: Session) -> str | None:
-    wls = session.exec(
-        select(WorkoutLift).where(WorkoutLift.lift_id == lift_id, WorkoutLift.id != current_wl_id)
-    ).all()
-    if not wls:
-        return None
-    best = max(wls, key=lambda wl: session.get(Workout, wl.workout_id).date)
-    return best.notes or None
+    notes = session.exec(
+        select(WorkoutLift.notes)
+        .join(Workout, Workout.id == WorkoutLift.workout_id)
+        .where(WorkoutLift.lift_id == lift_id, WorkoutLift.id != current_wl_id)
+        .order_by(Workout.date.desc(), WorkoutLift.id.asc())
+        .limit(1)
+    ).first()
+    return notes or None
+
+
+def _build_workout_lift_read(wl: WorkoutLift, session: Session) -> WorkoutLiftRead:
+    return WorkoutLiftRead(
+        id=wl.id,
+        lift_id=wl.lift_id,
+        lift_name=wl.lift.name if wl.lift else "",
+        display_order=wl.display_order,
+        sets=[
+            SetRead(id=s.id, set_number=s.set_number, reps=s.reps, weight=s.weight, done=s.done)
+            for s in wl.sets
+        ],
+        notes=wl.notes,
+        previous_notes=_get_previous_notes(wl.lift_id, wl.id, session),
+    )
 
 
 def _build_workout_read(workout: Workout, session: Session) -> WorkoutRead:
     workout_lifts_db = session.exec(
-        select(WorkoutLift).where(WorkoutLift.workout_id == workout.id)
-    ).all()
-
-    workout_lift_reads: list[WorkoutLiftRead] = []
-    for wl in workout_lifts_db:
-        lift = session.get(Lift, wl.lift_id)
-        lift_name = lift.name if lift else ""
-        sets_db = session.exec(select(WorkoutSet).where(WorkoutSet.workout_lift_id == wl.id)).all()
-        sets = [
-            SetRead(
-                id=s.id,
-                set_number=s.set_number,
-                reps=s.reps,
-                weight=s.weight,
-                done=s.done,
-            )
-            for s in sets_db
-        ]
-        previous_notes = _get_previous_notes(wl.lift_id, wl.id, session)
-        workout_lift_reads.append(
-            WorkoutLiftRead(
-                id=wl.id,
-                lift_id=wl.lift_id,
-                lift_name=lift_name,
-                display_order=wl.display_order,
-                sets=sets,
-                notes=wl.notes,
-                previous_notes=previous_notes,
-            )
+        select(WorkoutLift)
+        .where(WorkoutLift.workout_id == workout.id)
+        .options(
+            selectinload(WorkoutLift.lift),
+            selectinload(WorkoutLift.sets),
+            raiseload("*"),
         )
+        .order_by(WorkoutLift.id)
+    ).all()
 
     return WorkoutRead(
         id=workout.id,
-        date=workout.date.isoformat(),
+        date=workout.date,
         subtitle=workout.subtitle,
-        workout_lifts=workout_lift_reads,
+        workout_lifts=[_build_workout_lift_read(wl, session) for wl in workout_lifts_db],
     )
 
 
-def _delete_workout_cascade(workout: Workout, session: Session) -> None:
-    """Delete WorkoutSets -> WorkoutLifts -> Workout (SQLite has no auto-cascade)."""
-    workout_lifts = session.exec(
-        select(WorkoutLift).where(WorkoutLift.workout_id == workout.id)
-    ).all()
-    wl_ids = [wl.id for wl in workout_lifts]
-
-    if wl_ids:
-        sets = session.exec(select(WorkoutSet).where(WorkoutSet.workout_lift_id.in_(wl_ids))).all()
-        for s in sets:
-            session.delete(s)
-        for wl in workout_lifts:
-            session.delete(wl)
-
-    session.delete(workout)
-    session.commit()
-
-
-def _delete_workout_lift_cascade(wl: WorkoutLift, session: Session) -> None:
-    """Delete WorkoutSets for a WorkoutLift, then the WorkoutLift itself."""
-    sets = session.exec(select(WorkoutSet).where(WorkoutSet.workout_lift_id == wl.id)).all()
-    for s in sets:
-        session.delete(s)
-    session.delete(wl)
-    session.commit()
-
-
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
 
 
+_LIST_WORKOUTS = (
+    select(Workout)
+    .options(
+        selectinload(Workout.workout_lifts).selectinload(WorkoutLift.lift),
+        raiseload("*"),
+    )
+    .order_by(Workout.date.desc())
+)
+
+
 @router.get("", response_model=list[WorkoutSummary])
-def list_workouts(session: SessionDep):
-    workouts = session.exec(select(Workout).order_by(Workout.date.desc())).all()
-    result: list[WorkoutSummary] = []
-    for workout in workouts:
-        workout_lifts = session.exec(
-            select(WorkoutLift).where(WorkoutLift.workout_id == workout.id)
-        ).all()
-        lift_names: list[str] = []
-        for wl in workout_lifts:
-            lift = session.get(Lift, wl.lift_id)
-            if lift:
-                lift_names.append(lift.name)
-        result.append(
-            WorkoutSummary(
-                id=workout.id,
-                date=workout.date.isoformat(),
-                subtitle=workout.subtitle,
-                lift_names=lift_names,
-            )
+def list_workouts(session: ReadSessionDep):
+    workouts = session.exec(_LIST_WORKOUTS).all()
+    return [
+        WorkoutSummary(
+            id=workout.id,
+            date=workout.date,
+            subtitle=workout.subtitle,
+            lift_names=[wl.lift.name for wl in workout.workout_lifts if wl.lift],
         )
-    return result
+        for workout in workouts
+    ]
 
 
 @router.post("", response_model=WorkoutRead, status_code=201)
-def create_workout(session: SessionDep):
+def create_workout(session: WriteSessionDep):
     workout = Workout(date=date.today(), subtitle="")
     session.add(workout)
+    refresh_workout_indexes_cache(session)
     session.commit()
     session.refresh(workout)
     return _build_workout_read(workout, session)
 
 
 @router.get("/{id}", response_model=WorkoutRead)
-def get_workout(id: int, session: SessionDep):
+def get_workout(id: int, session: ReadSessionDep):
     workout = session.get(Workout, id)
     if workout is None:
         raise HTTPException(status_code=404, detail="Workout not found")
@@ -197,7 +170,7 @@ def get_workout(id: int, session: SessionDep):
 
 
 @router.patch("/{id}", response_model=WorkoutRead)
-def update_workout(id: int, body: SubtitleUpdate, session: SessionDep):
+def update_workout(id: int, body: SubtitleUpdate, session: WriteSessionDep):
     workout = session.get(Workout, id)
     if workout is None:
         raise HTTPException(status_code=404, detail="Workout not found")
@@ -209,15 +182,18 @@ def update_workout(id: int, body: SubtitleUpdate, session: SessionDep):
 
 
 @router.delete("/{id}", status_code=204)
-def delete_workout(id: int, session: SessionDep):
+def delete_workout(id: int, session: WriteSessionDep):
     workout = session.get(Workout, id)
     if workout is None:
         raise HTTPException(status_code=404, detail="Workout not found")
-    _delete_workout_cascade(workout, session)
+    # WorkoutLifts and their WorkoutSets go with it via ON DELETE CASCADE
+    session.delete(workout)
+    refresh_workout_indexes_cache(session)
+    session.commit()
 
 
 @router.post("/{id}/lifts", response_model=WorkoutLiftRead, status_code=201)
-def add_lift_to_workout(id: int, body: AddLiftBody, session: SessionDep):
+def add_lift_to_workout(id: int, body: AddLiftBody, session: WriteSessionDep):
     workout = session.get(Workout, id)
     if workout is None:
         raise HTTPException(status_code=404, detail="Workout not found")
@@ -230,6 +206,7 @@ def add_lift_to_workout(id: int, body: AddLiftBody, session: SessionDep):
         display_order=body.display_order,
     )
     session.add(wl)
+    refresh_workout_indexes_cache(session)
     session.commit()
     session.refresh(wl)
     previous_notes = _get_previous_notes(wl.lift_id, wl.id, session)
@@ -245,7 +222,7 @@ def add_lift_to_workout(id: int, body: AddLiftBody, session: SessionDep):
 
 
 @router.patch("/{id}/lifts/{wl_id}", response_model=WorkoutLiftRead)
-def update_workout_lift(id: int, wl_id: int, body: WorkoutLiftUpdate, session: SessionDep):
+def update_workout_lift(id: int, wl_id: int, body: WorkoutLiftUpdate, session: WriteSessionDep):
     wl = session.get(WorkoutLift, wl_id)
     if wl is None or wl.workout_id != id:
         raise HTTPException(status_code=404, detail="WorkoutLift not found")
@@ -253,39 +230,23 @@ def update_workout_lift(id: int, wl_id: int, body: WorkoutLiftUpdate, session: S
     session.add(wl)
     session.commit()
     session.refresh(wl)
-    lift = session.get(Lift, wl.lift_id)
-    lift_name = lift.name if lift else ""
-    sets_db = session.exec(select(WorkoutSet).where(WorkoutSet.workout_lift_id == wl.id)).all()
-    sets = [
-        SetRead(id=s.id, set_number=s.set_number, reps=s.reps, weight=s.weight, done=s.done)
-        for s in sets_db
-    ]
-    previous_notes = _get_previous_notes(wl.lift_id, wl.id, session)
-    return WorkoutLiftRead(
-        id=wl.id,
-        lift_id=wl.lift_id,
-        lift_name=lift_name,
-        display_order=wl.display_order,
-        sets=sets,
-        notes=wl.notes,
-        previous_notes=previous_notes,
-    )
+    return _build_workout_lift_read(wl, session)
 
 
 @router.delete("/{id}/lifts/{wl_id}", status_code=204)
-def remove_lift_from_workout(id: int, wl_id: int, session: SessionDep):
+def remove_lift_from_workout(id: int, wl_id: int, session: WriteSessionDep):
     wl = session.get(WorkoutLift, wl_id)
     if wl is None or wl.workout_id != id:
         raise HTTPException(status_code=404, detail="WorkoutLift not found")
-    _delete_workout_lift_cascade(wl, session)
+    session.delete(wl)
+    refresh_workout_indexes_cache(session)
+    session.commit()
 
 
 # ---------------------------------------------------------------------------
 # Suggest endpoint
 # ---------------------------------------------------------------------------
 
-from backend.services.algorithm import suggest_lift  # noqa: E402
-
 
 class SuggestResponse(SQLModel):
     muscle_group_id: int | None
@@ -296,7 +257,7 @@ class SuggestResponse(SQLModel):
 
 
 @router.post("/{workout_id}/suggest", response_model=SuggestResponse, status_code=200)
-def suggest_lift_for_workout(workout_id: int, session: SessionDep):
+def suggest_lift_for_workout(workout_id: int, session: ReadSessionDep):
     if session.get(Workout, workout_id) is None:
         raise HTTPException(status_code=404, detail="Workout not found")
     result = suggest_lift(workout_id, session)
@@ -8,17 +8,20 @@ WARNING: Drops all existing data before inserting.
 import random
 from datetime import date, timedelta
 
-from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel import Session, delete, insert
 
+from backend.database import create_db_and_tables, write_engine
 from backend.models import (
     Lift,
     LiftMuscleGroup,
     MuscleGroup,
     MuscleGroupConflict,
     Workout,
+    WorkoutIndexesCache,
     WorkoutLift,
     WorkoutSet,
 )
+from backend.services.indexes import refresh_workout_indexes_cache
 
 # Reproducible data
 RANDOM_SEED = 42
@@ -186,14 +189,15 @@ def _progression_reps(workout_idx: int, rng: random.Random) -> int:
 def seed() -> None:
     rng = random.Random(RANDOM_SEED)
 
-    engine = create_engine("sqlite:///gaindalf.db", connect_args={"check_same_thread": False})
-    SQLModel.metadata.create_all(engine)
+    # The app's write engine: WAL, synchronous=NORMAL and the other connection PRAGMAs
+    create_db_and_tables()
 
-    with Session(engine) as session:
+    with Session(write_engine) as session:
         # ------------------------------------------------------------------
         # Wipe existing data (order matters for FK constraints)
         # ------------------------------------------------------------------
         for model in [
+            WorkoutIndexesCache,
             WorkoutSet,
             WorkoutLift,
             Workout,
@@ -202,9 +206,7 @@ def seed() -> None:
             Lift,
             MuscleGroup,
         ]:
-            for row in session.exec(select(model)).all():
-                session.delete(row)
-        session.commit()
+            session.exec(delete(model))
         print("Cleared existing data.")
 
         # ------------------------------------------------------------------
@@ -215,9 +217,7 @@ def seed() -> None:
             mg = MuscleGroup(name=name)
             session.add(mg)
             mg_map[name] = mg
-        session.commit()
-        for mg in mg_map.values():
-            session.refresh(mg)
+        session.flush()
         print(f"Created {len(mg_map)} muscle groups.")
 
         # ------------------------------------------------------------------
@@ -234,30 +234,28 @@ def seed() -> None:
                     lift_map[lift_name] = lift
                 if is_late:
                     lift_late.add(lift_name)
-        session.commit()
-        for lift in lift_map.values():
-            session.refresh(lift)
-
-        for group_name, lifts in LIFTS.items():
-            for lift_name, _ in lifts:
-                link = LiftMuscleGroup(
-                    lift_id=lift_map[lift_name].id,
-                    muscle_group_id=mg_map[group_name].id,
-                )
-                session.add(link)
-        session.commit()
+        session.flush()
+
+        session.exec(
+            insert(LiftMuscleGroup),
+            params=[
+                {"lift_id": lift_map[lift_name].id, "muscle_group_id": mg_map[group_name].id}
+                for group_name, lifts in LIFTS.items()
+                for lift_name, _ in lifts
+            ],
+        )
         print(f"Created {len(lift_map)} lifts.")
 
         # ------------------------------------------------------------------
         # Conflicts
         # ------------------------------------------------------------------
-        for name_a, name_b in CONFLICTS:
-            conflict = MuscleGroupConflict(
-                muscle_group_a_id=mg_map[name_a].id,
-                muscle_group_b_id=mg_map[name_b].id,
-            )
-            session.add(conflict)
-        session.commit()
+        session.exec(
+            insert(MuscleGroupConflict),
+            params=[
+                {"muscle_group_a_id": mg_map[name_a].id, "muscle_group_b_id": mg_map[name_b].id}
+                for name_a, name_b in CONFLICTS
+            ],
+        )
         print(f"Created {len(CONFLICTS)} muscle group conflicts.")
 
         # ------------------------------------------------------------------
@@ -273,6 +271,11 @@ def seed() -> None:
             early_lifts_by_group[group_name] = [n for n, late in lifts if not late]
             all_lifts_by_group[group_name] = [n for n, _ in lifts]
 
+        # Rows are buffered and inserted in bulk after the loop; each entry of
+        # set_rows_by_workout_lift holds the sets for the same index of workout_lift_rows
+        workout_lift_rows: list[dict] = []
+        set_rows_by_workout_lift: list[list[dict]] = []
+
         for workout_idx, template in enumerate(WORKOUT_TEMPLATES):
             workout_date = start_date + timedelta(days=workout_idx * interval_days)
             is_late = workout_idx >= 10  # after workout 10, all lifts are available
@@ -280,8 +283,7 @@ def seed() -> None:
 
             workout = Workout(date=workout_date, subtitle=subtitle)
             session.add(workout)
-            session.commit()
-            session.refresh(workout)
+            session.flush()  # assigns workout.id
 
             for order, group_name in enumerate(template):
                 pool = (
@@ -292,37 +294,47 @@ def seed() -> None:
                 lift_name = rng.choice(pool)
                 lift = lift_map[lift_name]
 
-                wl = WorkoutLift(
-                    workout_id=workout.id,
-                    lift_id=lift.id,
-                    display_order=order,
+                workout_lift_rows.append(
+                    {"workout_id": workout.id, "lift_id": lift.id, "display_order": order}
                 )
-                session.add(wl)
-                session.commit()
-                session.refresh(wl)
 
                 base = BASE_WEIGHTS.get(lift_name)
                 num_sets = rng.randint(3, 4)
 
+                set_rows: list[dict] = []
                 for set_num in range(1, num_sets + 1):
                     if base is None:
                         # Bodyweight lift
-                        ws = WorkoutSet(
-                            workout_lift_id=wl.id,
-                            set_number=set_num,
-                            reps=_progression_reps(workout_idx, rng),
-                            weight=None,
+                        set_rows.append(
+                            {
+                                "set_number": set_num,
+                                "reps": _progression_reps(workout_idx, rng),
+                                "weight": None,
+                            }
                         )
                     else:
-                        ws = WorkoutSet(
-                            workout_lift_id=wl.id,
-                            set_number=set_num,
-                            reps=rng.randint(5, 10),
-                            weight=_progression_weight(base, workout_idx, rng),
+                        set_rows.append(
+                            {
+                                "set_number": set_num,
+                                "reps": rng.randint(5, 10),
+                                "weight": _progression_weight(base, workout_idx, rng),
+                            }
                         )
-                    session.add(ws)
-
-            session.commit()
+                set_rows_by_workout_lift.append(set_rows)
+
+        # One multi-row INSERT per table; RETURNING hands back the new ids in row order
+        workout_lift_ids = session.exec(
+            insert(WorkoutLift).returning(WorkoutLift.id, sort_by_parameter_order=True),
+            params=workout_lift_rows,
+        ).scalars()
+        set_rows = [
+            {"workout_lift_id": wl_id, **row}
+            for wl_id, rows in zip(workout_lift_ids, set_rows_by_workout_lift, strict=True)
+            for row in rows
+        ]
+        session.exec(insert(WorkoutSet), params=set_rows)
+        refresh_workout_indexes_cache(session)
+        session.commit()  # the only commit: the whole seed is one transaction
 
         print(f"Created {len(WORKOUT_TEMPLATES)} workouts.")
         print("Seed complete! ✦")
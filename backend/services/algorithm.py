@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from datetime import date
 
 from fastapi import HTTPException
+from sqlalchemy import func, literal, union_all
 from sqlmodel import Session, select
 
 from backend.models import (
@@ -37,134 +37,87 @@ class SuggestResult:
 # ---------------------------------------------------------------------------
 
 
-def _get_used_group_ids(workout_id: int, session: Session) -> set[int]:
-    """Return the set of muscle_group_ids already represented in this workout."""
-    workout_lifts = session.exec(
-        select(WorkoutLift).where(WorkoutLift.workout_id == workout_id)
-    ).all()
-    lift_ids = [wl.lift_id for wl in workout_lifts]
-    if not lift_ids:
-        return set()
-    lmg_rows = session.exec(
-        select(LiftMuscleGroup).where(LiftMuscleGroup.lift_id.in_(lift_ids))
-    ).all()
-    return {row.muscle_group_id for row in lmg_rows}
-
-
-def _get_conflict_group_ids(used_group_ids: set[int], session: Session) -> set[int]:
-    """Return muscle_group_ids that conflict with any used group (excluding used ones)."""
-    if not used_group_ids:
-        return set()
-    conflicts = session.exec(
-        select(MuscleGroupConflict).where(
-            MuscleGroupConflict.muscle_group_a_id.in_(used_group_ids)
-            | MuscleGroupConflict.muscle_group_b_id.in_(used_group_ids)
+def _get_used_and_conflict_group_ids(
+    workout_id: int, session: Session
+) -> tuple[set[int], set[int]]:
+    """
+    Return (used, conflicting) muscle_group_ids for this workout, in one query.
+
+    Used groups are those already represented in the workout; conflicting groups are the
+    other side of any conflict with a used group, excluding the used ones themselves.
+    """
+    used = (
+        select(LiftMuscleGroup.muscle_group_id)
+        .join(WorkoutLift, WorkoutLift.lift_id == LiftMuscleGroup.lift_id)
+        .where(WorkoutLift.workout_id == workout_id)
+        .cte("used")
+    )
+    used_ids = select(used.c.muscle_group_id)
+    rows = session.exec(
+        union_all(
+            select(used.c.muscle_group_id, literal(True)),
+            select(MuscleGroupConflict.muscle_group_b_id, literal(False)).where(
+                MuscleGroupConflict.muscle_group_a_id.in_(used_ids)
+            ),
+            select(MuscleGroupConflict.muscle_group_a_id, literal(False)).where(
+                MuscleGroupConflict.muscle_group_b_id.in_(used_ids)
+            ),
         )
     ).all()
-    conflict_ids: set[int] = set()
-    for c in conflicts:
-        if c.muscle_group_a_id not in used_group_ids:
-            conflict_ids.add(c.muscle_group_a_id)
-        if c.muscle_group_b_id not in used_group_ids:
-            conflict_ids.add(c.muscle_group_b_id)
-    return conflict_ids
-
-
-def _last_trained_date(group_id: int, session: Session) -> date | None:
-    """Return the most recent workout date for the given muscle group, or None."""
-    lmg_rows = session.exec(
-        select(LiftMuscleGroup).where(LiftMuscleGroup.muscle_group_id == group_id)
-    ).all()
-    lift_ids = [row.lift_id for row in lmg_rows]
-    if not lift_ids:
-        return None
-    workout_lifts = session.exec(select(WorkoutLift).where(WorkoutLift.lift_id.in_(lift_ids))).all()
-    if not workout_lifts:
-        return None
-    workout_ids = [wl.workout_id for wl in workout_lifts]
-    workouts = session.exec(select(Workout).where(Workout.id.in_(workout_ids))).all()
-    if not workouts:
-        return None
-    return max(w.date for w in workouts)
+    used_group_ids = {group_id for group_id, is_used in rows if is_used}
+    conflict_group_ids = {group_id for group_id, is_used in rows if not is_used} - used_group_ids
+    return used_group_ids, conflict_group_ids
 
 
 def _select_candidate_group(candidates: set[int], session: Session) -> MuscleGroup:
-    """Among candidate group_ids, pick the one with the oldest last_trained date."""
-    best_group_id: int | None = None
-    best_date: date | None = None
-    found_none = False
-
-    for group_id in candidates:
-        last = _last_trained_date(group_id, session)
-        if last is None:
-            if not found_none:
-                found_none = True
-                best_group_id = group_id
-                best_date = None
-        elif not found_none:
-            if best_group_id is None or last < best_date:
-                best_group_id = group_id
-                best_date = last
-
-    group = session.get(MuscleGroup, best_group_id)
-    return group
-
-
-def _last_done_date_for_lift(lift_id: int, session: Session) -> date | None:
-    """Return the most recent workout date for the given lift, or None."""
-    workout_lifts = session.exec(select(WorkoutLift).where(WorkoutLift.lift_id == lift_id)).all()
-    if not workout_lifts:
-        return None
-    workout_ids = [wl.workout_id for wl in workout_lifts]
-    workouts = session.exec(select(Workout).where(Workout.id.in_(workout_ids))).all()
-    if not workouts:
-        return None
-    return max(w.date for w in workouts)
-
-
-def _select_lift_from_ids(lift_ids: list[int], session: Session) -> int:
-    """Among the given lift IDs, pick the least recently done one."""
-    best_lift_id: int | None = None
-    best_date: date | None = None
-    found_none = False
-
-    for lift_id in lift_ids:
-        last = _last_done_date_for_lift(lift_id, session)
-        if last is None:
-            if not found_none:
-                found_none = True
-                best_lift_id = lift_id
-        elif not found_none:
-            if best_lift_id is None or last < best_date:
-                best_lift_id = lift_id
-                best_date = last
-
-    return best_lift_id
+    """
+    Among candidate group_ids, pick the one with the oldest last_trained date.
+
+    Never-trained groups sort first (NULL dates); ties go to the lowest id.
+    """
+    return session.exec(
+        select(MuscleGroup)
+        .outerjoin(LiftMuscleGroup, LiftMuscleGroup.muscle_group_id == MuscleGroup.id)
+        .outerjoin(WorkoutLift, WorkoutLift.lift_id == LiftMuscleGroup.lift_id)
+        .outerjoin(Workout, Workout.id == WorkoutLift.workout_id)
+        .where(MuscleGroup.id.in_(candidates))
+        .group_by(MuscleGroup.id)
+        .order_by(func.max(Workout.date).asc().nulls_first(), MuscleGroup.id)
+        .limit(1)
+    ).one()
+
+
+def _select_lift_from_ids(lift_ids: list[int], session: Session) -> Lift:
+    """
+    Among the given lift IDs, pick the least recently done one.
+
+    Lifts never done sort first (NULL dates); ties go to the lowest id.
+    """
+    return session.exec(
+        select(Lift)
+        .outerjoin(WorkoutLift, WorkoutLift.lift_id == Lift.id)
+        .outerjoin(Workout, Workout.id == WorkoutLift.workout_id)
+        .where(Lift.id.in_(lift_ids))
+        .group_by(Lift.id)
+        .order_by(func.max(Workout.date).asc().nulls_first(), Lift.id)
+        .limit(1)
+    ).one()
 
 
 def _get_previous_sets(lift_id: int, session: Session) -> list[SetData]:
     """Return the WorkoutSets from the most recent WorkoutLift for this lift."""
-    workout_lifts = session.exec(select(WorkoutLift).where(WorkoutLift.lift_id == lift_id)).all()
-    if not workout_lifts:
-        return []
-
-    # Find the most recent workout for this lift
-    best_wl: WorkoutLift | None = None
-    best_date: date | None = None
-    for wl in workout_lifts:
-        workout = session.get(Workout, wl.workout_id)
-        if workout is None:
-            continue
-        if best_date is None or workout.date > best_date:
-            best_date = workout.date
-            best_wl = wl
-
-    if best_wl is None:
-        return []
-
+    # Same-day ties go to the earliest WorkoutLift, as they always have
+    latest_workout_lift_id = (
+        select(WorkoutLift.id)
+        .join(Workout, Workout.id == WorkoutLift.workout_id)
+        .where(WorkoutLift.lift_id == lift_id)
+        .order_by(Workout.date.desc(), WorkoutLift.id.asc())
+        .limit(1)
+        .scalar_subquery()
+    )
     sets = session.exec(
         select(WorkoutSet)
-        .where(WorkoutSet.workout_lift_id == best_wl.id)
+        .where(WorkoutSet.workout_lift_id == latest_workout_lift_id)
         .order_by(WorkoutSet.set_number)
     ).all()
 
@@ -209,8 +162,7 @@ def suggest_lift(workout_id: int, session: Session) -> SuggestResult:
     groups_with_available = set(group_to_available.keys())
 
     # Muscle groups already used in this workout
-    used_group_ids = _get_used_group_ids(workout_id, session)
-    conflict_group_ids = _get_conflict_group_ids(used_group_ids, session)
+    used_group_ids, conflict_group_ids = _get_used_and_conflict_group_ids(workout_id, session)
 
     # Ideal: not used, not conflicting, has available lifts
     candidates = groups_with_available - used_group_ids - conflict_group_ids
@@ -226,17 +178,16 @@ def suggest_lift(workout_id: int, session: Session) -> SuggestResult:
     if candidates:
         selected_group = _select_candidate_group(candidates, session)
         lift_ids = list(group_to_available[selected_group.id])
-        selected_lift_id = _select_lift_from_ids(lift_ids, session)
+        selected_lift = _select_lift_from_ids(lift_ids, session)
         selected_group_id: int | None = selected_group.id
         selected_group_name: str | None = selected_group.name
     else:
         # Available lifts have no muscle group assignments — pick least recently done
-        selected_lift_id = _select_lift_from_ids(list(available_lift_ids), session)
+        selected_lift = _select_lift_from_ids(list(available_lift_ids), session)
         selected_group_id = None
         selected_group_name = None
 
-    selected_lift = session.get(Lift, selected_lift_id)
-    previous_sets = _get_previous_sets(selected_lift_id, session)
+    previous_sets = _get_previous_sets(selected_lift.id, session)
 
     return SuggestResult(
         muscle_group_id=selected_group_id,
@@ -1,8 +1,10 @@
+from collections.abc import Collection
 from dataclasses import dataclass
 
-from sqlmodel import Session, select
+from sqlalchemy import ColumnElement, Select
+from sqlmodel import Session, func, insert, select
 
-from backend.models import Workout, WorkoutLift, WorkoutSet
+from backend.models import Workout, WorkoutIndexesCache, WorkoutLift, WorkoutSet
 
 
 @dataclass
@@ -13,62 +15,110 @@ class WorkoutIndexes:
     endurance_index: float | None
 
 
-def _get_baseline_workout_lift_id(lift_id: int, session: Session) -> int | None:
-    """Return the WorkoutLift.id for the very first appearance of this lift."""
-    statement = (
-        select(WorkoutLift.id)
-        .join(Workout, Workout.id == WorkoutLift.workout_id)
-        .where(WorkoutLift.lift_id == lift_id)
-        .order_by(Workout.date.asc(), WorkoutLift.id.asc())
-        .limit(1)
-    )
-    return session.exec(statement).first()
+Baselines = dict[int, tuple[float | None, float]]
 
 
-def _max_weight_for_workout_lift(workout_lift_id: int, session: Session) -> float | None:
-    """Return the max weight across all sets for a given WorkoutLift, or None."""
-    sets = session.exec(
-        select(WorkoutSet).where(WorkoutSet.workout_lift_id == workout_lift_id)
+def _get_baselines(session: Session, lift_ids: Collection[int] | None = None) -> Baselines:
+    """
+    Return {lift_id: (baseline_max, baseline_volume)} for the given lifts (default: all).
+
+    A lift's baseline is its very first appearance (earliest workout, then lowest
+    WorkoutLift.id); lifts that were never done are absent.
+    """
+    appearances = select(
+        WorkoutLift.id,
+        WorkoutLift.lift_id,
+        func.row_number()
+        .over(
+            partition_by=WorkoutLift.lift_id,
+            order_by=(Workout.date.asc(), WorkoutLift.id.asc()),
+        )
+        .label("appearance"),
+    ).join(Workout, Workout.id == WorkoutLift.workout_id)
+    if lift_ids is not None:
+        appearances = appearances.where(WorkoutLift.lift_id.in_(lift_ids))
+    ranked = appearances.subquery()
+
+    rows = session.exec(
+        select(
+            ranked.c.lift_id,
+            func.max(WorkoutSet.weight),
+            func.sum(WorkoutSet.reps * WorkoutSet.weight),
+        )
+        .outerjoin(WorkoutSet, WorkoutSet.workout_lift_id == ranked.c.id)
+        .where(ranked.c.appearance == 1)
+        .group_by(ranked.c.lift_id)
     ).all()
-    weights = [s.weight for s in sets if s.weight is not None]
-    return max(weights) if weights else None
+    return {
+        lift_id: (baseline_max, baseline_volume or 0.0)
+        for lift_id, baseline_max, baseline_volume in rows
+    }
 
 
-def _volume_for_workout_lift(workout_lift_id: int, session: Session) -> float:
-    """Return sum(reps * weight) for all sets where both reps and weight are non-null."""
-    sets = session.exec(
-        select(WorkoutSet).where(WorkoutSet.workout_lift_id == workout_lift_id)
+def _get_baselines_for_workouts(session: Session, workout_ids: Collection[int]) -> Baselines:
+    """Return baselines for just the lifts done in the given workouts."""
+    lift_ids = session.exec(
+        select(WorkoutLift.lift_id).where(WorkoutLift.workout_id.in_(workout_ids)).distinct()
     ).all()
-    return sum(s.reps * s.weight for s in sets if s.reps is not None and s.weight is not None)
+    return _get_baselines(session, lift_ids) if lift_ids else {}
+
+
+def _workout_lift_aggregates(*criteria: ColumnElement[bool]) -> Select:
+    """
+    Select lift_id, workout_id, date, max_weight and volume for each matching WorkoutLift.
+
+    max_weight ignores sets without a weight (None when there are none); volume is
+    sum(reps * weight) over sets where both are set (None when there are none).
+    """
+    return (
+        select(
+            WorkoutLift.lift_id,
+            WorkoutLift.workout_id,
+            Workout.date,
+            func.max(WorkoutSet.weight).label("max_weight"),
+            func.sum(WorkoutSet.reps * WorkoutSet.weight).label("volume"),
+        )
+        .join(Workout, Workout.id == WorkoutLift.workout_id)
+        .outerjoin(WorkoutSet, WorkoutSet.workout_lift_id == WorkoutLift.id)
+        .where(*criteria)
+        .group_by(WorkoutLift.id)
+    )
+
 
+def calculate_workout_indexes(
+    workout_id: int, session: Session, baselines: Baselines | None = None
+) -> WorkoutIndexes:
+    """
+    Compute strength and endurance indexes for a single workout.
 
-def calculate_workout_indexes(workout_id: int, session: Session) -> WorkoutIndexes:
-    """Compute strength and endurance indexes for a single workout."""
-    workout = session.get(Workout, workout_id)
-    if workout is None:
+    Pass `baselines` from _get_baselines() when calculating many workouts, so they are
+    looked up once instead of per workout.
+    """
+    workout_date = session.exec(select(Workout.date).where(Workout.id == workout_id)).first()
+    if workout_date is None:
         raise ValueError(f"Workout {workout_id} not found")
 
     workout_lifts = session.exec(
-        select(WorkoutLift).where(WorkoutLift.workout_id == workout_id)
+        _workout_lift_aggregates(WorkoutLift.workout_id == workout_id).order_by(WorkoutLift.id)
     ).all()
+    if baselines is None:
+        baselines = _get_baselines(session, {wl.lift_id for wl in workout_lifts})
 
     strength_ratios: list[float] = []
     endurance_ratios: list[float] = []
 
     for wl in workout_lifts:
-        baseline_wl_id = _get_baseline_workout_lift_id(wl.lift_id, session)
-        if baseline_wl_id is None:
+        if wl.lift_id not in baselines:
             continue
+        baseline_max, baseline_volume = baselines[wl.lift_id]
 
         # --- Strength index ---
-        baseline_max = _max_weight_for_workout_lift(baseline_wl_id, session)
-        current_max = _max_weight_for_workout_lift(wl.id, session)
+        current_max = wl.max_weight
         if baseline_max is not None and baseline_max > 0 and current_max is not None:
             strength_ratios.append(current_max / baseline_max)
 
         # --- Endurance index ---
-        baseline_volume = _volume_for_workout_lift(baseline_wl_id, session)
-        current_volume = _volume_for_workout_lift(wl.id, session)
+        current_volume = wl.volume or 0.0
         if baseline_volume > 0:
             endurance_ratios.append(current_volume / baseline_volume)
 
@@ -77,16 +127,68 @@ def calculate_workout_indexes(workout_id: int, session: Session) -> WorkoutIndex
 
     return WorkoutIndexes(
         workout_id=workout_id,
-        date=workout.date.isoformat(),
+        date=workout_date.isoformat(),
         strength_index=strength_index,
         endurance_index=endurance_index,
     )
 
 
 def get_all_workout_indexes(session: Session) -> list[WorkoutIndexes]:
-    """Return WorkoutIndexes for every workout, ordered by date ASC."""
-    workouts = session.exec(select(Workout).order_by(Workout.date.asc())).all()
-    return [calculate_workout_indexes(w.id, session) for w in workouts]
+    """
+    Return WorkoutIndexes for every workout, ordered by date ASC.
+
+    Served from WorkoutIndexesCache; a workout missing from it (written since the last
+    refresh, or outside the API) is calculated on the spot instead.
+    """
+    rows = session.exec(
+        select(
+            Workout.id,
+            Workout.date,
+            WorkoutIndexesCache.workout_id,
+            WorkoutIndexesCache.strength_index,
+            WorkoutIndexesCache.endurance_index,
+        )
+        .outerjoin(WorkoutIndexesCache, WorkoutIndexesCache.workout_id == Workout.id)
+        .order_by(Workout.date.asc())
+    ).all()
+    uncached_ids = [workout_id for workout_id, _, cached_id, _, _ in rows if cached_id is None]
+    baselines = _get_baselines_for_workouts(session, uncached_ids) if uncached_ids else {}
+    return [
+        WorkoutIndexes(
+            workout_id=workout_id,
+            date=workout_date.isoformat(),
+            strength_index=strength_index,
+            endurance_index=endurance_index,
+        )
+        if cached_id is not None
+        else calculate_workout_indexes(workout_id, session, baselines)
+        for workout_id, workout_date, cached_id, strength_index, endurance_index in rows
+    ]
+
+
+def refresh_workout_indexes_cache(session: Session) -> None:
+    """Calculate and store indexes for every workout missing from WorkoutIndexesCache."""
+    missing_ids = session.exec(
+        select(Workout.id)
+        .outerjoin(WorkoutIndexesCache, WorkoutIndexesCache.workout_id == Workout.id)
+        .where(WorkoutIndexesCache.workout_id.is_(None))
+    ).all()
+    if not missing_ids:
+        return
+
+    # Only the lifts in these workouts matter, so write cost doesn't grow with all history
+    baselines = _get_baselines_for_workouts(session, missing_ids)
+    rows = []
+    for workout_id in missing_ids:
+        indexes = calculate_workout_indexes(workout_id, session, baselines)
+        rows.append(
+            {
+                "workout_id": workout_id,
+                "strength_index": indexes.strength_index,
+                "endurance_index": indexes.endurance_index,
+            }
+        )
+    session.exec(insert(WorkoutIndexesCache).values(rows))
 
 
 def get_lift_index_history(lift_id: int, session: Session) -> list[WorkoutIndexes]:
@@ -94,24 +196,17 @@ def get_lift_index_history(lift_id: int, session: Session) -> list[WorkoutIndexe
     Return WorkoutIndexes for every workout that contains the given lift,
     ordered by date ASC. Each result reflects only that single lift's contribution.
     """
-    statement = (
-        select(WorkoutLift)
-        .join(Workout, Workout.id == WorkoutLift.workout_id)
-        .where(WorkoutLift.lift_id == lift_id)
-        .order_by(Workout.date.asc(), WorkoutLift.id.asc())
+    statement = _workout_lift_aggregates(WorkoutLift.lift_id == lift_id).order_by(
+        Workout.date.asc(), WorkoutLift.id.asc()
     )
     workout_lifts = session.exec(statement).all()
 
-    baseline_wl_id = _get_baseline_workout_lift_id(lift_id, session)
-    baseline_max = _max_weight_for_workout_lift(baseline_wl_id, session) if baseline_wl_id else None
-    baseline_volume = _volume_for_workout_lift(baseline_wl_id, session) if baseline_wl_id else 0.0
+    baseline_max, baseline_volume = _get_baselines(session, [lift_id]).get(lift_id, (None, 0.0))
 
     results: list[WorkoutIndexes] = []
     for wl in workout_lifts:
-        workout = session.get(Workout, wl.workout_id)
-
-        current_max = _max_weight_for_workout_lift(wl.id, session)
-        current_volume = _volume_for_workout_lift(wl.id, session)
+        current_max = wl.max_weight
+        current_volume = wl.volume or 0.0
 
         if baseline_max is not None and baseline_max > 0 and current_max is not None:
             strength_index: float | None = current_max / baseline_max
@@ -126,7 +221,7 @@ def get_lift_index_history(lift_id: int, session: Session) -> list[WorkoutIndexe
         results.append(
             WorkoutIndexes(
                 workout_id=wl.workout_id,
-                date=workout.date.isoformat(),
+                date=wl.date.isoformat(),
                 strength_index=strength_index,
                 endurance_index=endurance_index,
             )
@@ -502,7 +502,11 @@ function buildLiftRow(lift) {
       renderLiftsTbody();
     } catch (err) {
       console.error('Failed to delete lift:', err);
-      showError('Could not delete lift.');
+      if (err.message && err.message.startsWith('409 ')) {
+        showError('This lift has workout history, so it can\'t be deleted.');
+      } else {
+        showError('Could not delete lift.');
+      }
     }
   });
   deleteTd.appendChild(deleteBtn);
@@ -1,14 +1,27 @@
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
-from backend.database import get_session
-from backend.main import app
+import backend.models as _models  # noqa: F401 — registers tables with SQLModel metadata
+from backend.database import get_read_session, get_write_session
 
 
-@pytest.fixture(name="session")
-def session_fixture():
+def _configure_connection(dbapi_connection, connection_record):
+    # ON DELETE CASCADE only fires when SQLite enforces foreign keys
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+    # Let SQLAlchemy emit BEGIN itself, so the per-test SAVEPOINTs below work with pysqlite
+    dbapi_connection.isolation_level = None
+
+
+def _begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture():
     # StaticPool ensures the in-memory DB is shared across all connections,
     # including those spawned by TestClient's anyio thread pool.
     engine = create_engine(
@@ -16,16 +29,45 @@ def session_fixture():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+    event.listen(engine, "connect", _configure_connection)
+    event.listen(engine, "begin", _begin)
+    # Brand-new in-memory database, so skip the per-table existence probes
+    SQLModel.metadata.create_all(engine, checkfirst=False)
+    yield engine
+    engine.dispose()
 
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def override_get_session():
-        yield session
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    # The schema is created once per run; each test works inside a transaction that is
+    # rolled back afterwards. Commits and rollbacks in the code under test only release
+    # or roll back SAVEPOINTs within it. Objects expire on commit, as in the app's sessions.
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+            yield session
+        transaction.rollback()
 
-    app.dependency_overrides[get_session] = override_get_session
-    yield TestClient(app)
-    app.dependency_overrides.clear()
+
+@pytest.fixture(name="test_app", scope="module")
+def test_app_fixture(request) -> FastAPI:
+    """An isolated app serving only the test module's ``ROUTER_MOUNT = (router, prefix)``."""
+    router, prefix = request.module.ROUTER_MOUNT
+    test_app = FastAPI()
+    test_app.include_router(router, prefix=prefix)
+    return test_app
+
+
+@pytest.fixture(name="module_client", scope="module")
+def module_client_fixture(test_app: FastAPI):
+    # One event loop portal and lifespan for the whole module rather than one per test
+    with TestClient(test_app) as client:
+        yield client
+
+
+@pytest.fixture(name="client")
+def client_fixture(test_app: FastAPI, module_client: TestClient, session: Session):
+    test_app.dependency_overrides[get_read_session] = lambda: session
+    test_app.dependency_overrides[get_write_session] = lambda: session
+    yield module_client
+    test_app.dependency_overrides.clear()
@@ -0,0 +1,18 @@
+"""Test data helpers shared across test modules."""
+
+from sqlmodel import Session, insert
+
+from backend.models import WorkoutSet
+
+
+def add_sets(
+    session: Session, workout_lift_id: int, sets: list[tuple[int | None, float | None]]
+) -> None:
+    """Insert (reps, weight) sets numbered from 1, in a single executemany INSERT."""
+    session.exec(
+        insert(WorkoutSet),
+        params=[
+            {"workout_lift_id": workout_lift_id, "set_number": n, "reps": reps, "weight": weight}
+            for n, (reps, weight) in enumerate(sets, start=1)
+        ],
+    )
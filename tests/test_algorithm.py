@@ -2,35 +2,17 @@
 
 from datetime import date, timedelta
 
-import pytest
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session
 
 from backend.models import (
     Lift,
-    LiftMuscleGroup,
     MuscleGroup,
     MuscleGroupConflict,
     Workout,
     WorkoutLift,
-    WorkoutSet,
 )
 from backend.services.algorithm import suggest_lift
-
-
-@pytest.fixture(name="session")
-def session_fixture():
-    import backend.models as _models  # noqa: F401
-
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
+from tests.helpers import add_sets
 
 # ---------------------------------------------------------------------------
 # Helper factories
@@ -40,64 +22,37 @@ def session_fixture():
 def _add_muscle_group(session: Session, name: str) -> MuscleGroup:
     mg = MuscleGroup(name=name)
     session.add(mg)
-    session.commit()
-    session.refresh(mg)
+    session.flush()
     return mg
 
 
 def _add_lift(session: Session, name: str, *muscle_groups: MuscleGroup) -> Lift:
-    lift = Lift(name=name)
+    lift = Lift(name=name, muscle_groups=list(muscle_groups))
     session.add(lift)
-    session.commit()
-    session.refresh(lift)
-    for mg in muscle_groups:
-        lmg = LiftMuscleGroup(lift_id=lift.id, muscle_group_id=mg.id)
-        session.add(lmg)
-    session.commit()
+    session.flush()
     return lift
 
 
 def _add_conflict(session: Session, mg_a: MuscleGroup, mg_b: MuscleGroup) -> None:
     conflict = MuscleGroupConflict(muscle_group_a_id=mg_a.id, muscle_group_b_id=mg_b.id)
     session.add(conflict)
-    session.commit()
+    session.flush()
 
 
 def _add_workout(session: Session, workout_date: date) -> Workout:
     workout = Workout(date=workout_date)
     session.add(workout)
-    session.commit()
-    session.refresh(workout)
+    session.flush()
     return workout
 
 
 def _add_workout_lift(session: Session, workout: Workout, lift: Lift) -> WorkoutLift:
     wl = WorkoutLift(workout_id=workout.id, lift_id=lift.id)
     session.add(wl)
-    session.commit()
-    session.refresh(wl)
+    session.flush()
     return wl
 
 
-def _add_set(
-    session: Session,
-    workout_lift: WorkoutLift,
-    set_number: int,
-    reps: int | None = None,
-    weight: float | None = None,
-) -> WorkoutSet:
-    ws = WorkoutSet(
-        workout_lift_id=workout_lift.id,
-        set_number=set_number,
-        reps=reps,
-        weight=weight,
-    )
-    session.add(ws)
-    session.commit()
-    session.refresh(ws)
-    return ws
-
-
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -181,6 +136,27 @@ def test_avoids_conflicting_groups(session: Session):
     assert result.lift_id == lift_c.id
 
 
+def test_avoids_conflicting_groups_either_direction(session: Session):
+    """A conflict stored as (B, A) excludes B just like one stored as (A, B)."""
+    group_a = _add_muscle_group(session, "Chest")
+    group_b = _add_muscle_group(session, "Shoulders")
+    group_c = _add_muscle_group(session, "Legs")
+
+    lift_a = _add_lift(session, "Bench Press", group_a)
+    _add_lift(session, "Overhead Press", group_b)
+    lift_c = _add_lift(session, "Squat", group_c)
+
+    _add_conflict(session, group_b, group_a)
+
+    workout = _add_workout(session, date.today())
+    _add_workout_lift(session, workout, lift_a)
+
+    result = suggest_lift(workout.id, session)
+
+    assert result.muscle_group_id == group_c.id
+    assert result.lift_id == lift_c.id
+
+
 def test_relaxes_conflict_when_all_excluded(session: Session):
     """If all non-used groups conflict with the used group, fall back to any non-used group."""
     group_a = _add_muscle_group(session, "Chest")
@@ -230,9 +206,7 @@ def test_previous_sets_populated(session: Session):
 
     past_workout = _add_workout(session, date.today() - timedelta(days=7))
     past_wl = _add_workout_lift(session, past_workout, bench)
-    _add_set(session, past_wl, set_number=1, reps=5, weight=100.0)
-    _add_set(session, past_wl, set_number=2, reps=5, weight=100.0)
-    _add_set(session, past_wl, set_number=3, reps=4, weight=100.0)
+    add_sets(session, past_wl.id, [(5, 100.0), (5, 100.0), (4, 100.0)])
 
     today_workout = _add_workout(session, date.today())
 
@@ -1,36 +1,13 @@
 from datetime import date
 
 import pytest
-from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session
 
-from backend.database import get_session
 from backend.models import Lift, Workout, WorkoutLift, WorkoutSet
 from backend.routers.analytics import router
 
-
-@pytest.fixture(name="session")
-def session_fixture():
-    import backend.models as _models  # noqa: F401
-
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    test_app = FastAPI()
-    test_app.include_router(router, prefix="/api/analytics")
-    test_app.dependency_overrides[get_session] = lambda: session
-    return TestClient(test_app)
+ROUTER_MOUNT = (router, "/api/analytics")
 
 
 # ---------------------------------------------------------------------------
@@ -41,31 +18,28 @@ def client_fixture(session: Session):
 def _make_lift(session: Session, name: str) -> int:
     lift = Lift(name=name)
     session.add(lift)
-    session.commit()
-    session.refresh(lift)
+    session.flush()
     return lift.id
 
 
 def _make_workout(session: Session, d: date) -> int:
     workout = Workout(date=d)
     session.add(workout)
-    session.commit()
-    session.refresh(workout)
+    session.flush()
     return workout.id
 
 
 def _add_lift_to_workout(session: Session, workout_id: int, lift_id: int) -> int:
     wl = WorkoutLift(workout_id=workout_id, lift_id=lift_id)
     session.add(wl)
-    session.commit()
-    session.refresh(wl)
+    session.flush()
     return wl.id
 
 
 def _add_set(session: Session, wl_id: int, reps: int, weight: float):
     ws = WorkoutSet(workout_lift_id=wl_id, set_number=1, reps=reps, weight=weight)
     session.add(ws)
-    session.commit()
+    session.flush()
 
 
 # ---------------------------------------------------------------------------
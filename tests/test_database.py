@@ -0,0 +1,74 @@
+"""Routes against the real file-backed engines, which the session overrides elsewhere bypass."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+import backend.database as database
+from backend.main import app
+from backend.models import MuscleGroup, WorkoutSet
+
+
+@pytest.fixture(name="engines")
+def engines_fixture(tmp_path, monkeypatch):
+    write_engine, read_engine = database.create_engines(str(tmp_path / "gaindalf.db"))
+    monkeypatch.setattr(database, "write_engine", write_engine)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    database.create_db_and_tables()
+    yield write_engine, read_engine
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+@pytest.fixture(name="file_client")
+def file_client_fixture(engines):
+    # No lifespan: the engines are already set up
+    return TestClient(app)
+
+
+def test_read_engine_rejects_writes(engines):
+    _, read_engine = engines
+    with Session(read_engine) as session:
+        session.add(MuscleGroup(name="Chest"))
+        with pytest.raises(OperationalError, match="readonly"):
+            session.commit()
+
+
+def test_routes_commit_writes_and_serve_reads_read_only(engines, file_client: TestClient):
+    _, read_engine = engines
+    chest_id = file_client.post("/api/muscle-groups", json={"id": 0, "name": "Chest"}).json()["id"]
+    back_id = file_client.post("/api/muscle-groups", json={"id": 0, "name": "Back"}).json()["id"]
+    lift_id = file_client.post(
+        "/api/lifts", json={"name": "Bench Press", "muscle_group_ids": [chest_id]}
+    ).json()["id"]
+    file_client.post("/api/lifts", json={"name": "Barbell Row", "muscle_group_ids": [back_id]})
+    conflict = file_client.post(
+        "/api/settings/conflicts",
+        json={"muscle_group_a_id": chest_id, "muscle_group_b_id": back_id},
+    )
+    assert conflict.status_code == 201
+    workout_id = file_client.post("/api/workouts").json()["id"]
+    wl_id = file_client.post(f"/api/workouts/{workout_id}/lifts", json={"lift_id": lift_id}).json()[
+        "id"
+    ]
+    added = file_client.post(f"/api/workout-lifts/{wl_id}/sets", json={"reps": 5, "weight": 80.0})
+    assert added.status_code == 201
+
+    # Committed by the write engine, so a separate read-only connection sees them
+    with Session(read_engine) as session:
+        assert session.exec(select(WorkoutSet.reps)).all() == [5]
+
+    for path in [
+        "/api/muscle-groups",
+        "/api/lifts",
+        f"/api/lifts/{lift_id}/last-sets",
+        "/api/settings/conflicts",
+        "/api/workouts",
+        f"/api/workouts/{workout_id}",
+        "/api/analytics/progress",
+        f"/api/analytics/lifts/{lift_id}",
+    ]:
+        assert file_client.get(path).status_code == 200, path
+    # The suggest POST only reads, so it is served by the read-only engine too
+    assert file_client.post(f"/api/workouts/{workout_id}/suggest").status_code == 200
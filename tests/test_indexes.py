@@ -1,34 +1,18 @@
 from datetime import date
 
 import pytest
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, delete, select
 
+import backend.services.indexes as indexes
+from backend.models import Lift, Workout, WorkoutIndexesCache, WorkoutLift, WorkoutSet
 from backend.services.indexes import (
     WorkoutIndexes,
     calculate_workout_indexes,
     get_all_workout_indexes,
     get_lift_index_history,
+    refresh_workout_indexes_cache,
 )
-
-# ---------------------------------------------------------------------------
-# Session fixture (independent of the app's engine)
-# ---------------------------------------------------------------------------
-
-
-@pytest.fixture(name="session")
-def session_fixture():
-    import backend.models as _models  # noqa: F401
-
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
+from tests.helpers import add_sets
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -37,34 +21,25 @@ def session_fixture():
 
 def make_workout(session: Session, d: date) -> int:
     """Insert a Workout and return its id."""
-    from backend.models import Workout
-
     w = Workout(date=d)
     session.add(w)
-    session.commit()
-    session.refresh(w)
+    session.flush()
     return w.id
 
 
 def make_lift(session: Session, name: str) -> int:
     """Insert a Lift and return its id."""
-    from backend.models import Lift
-
     lift = Lift(name=name)
     session.add(lift)
-    session.commit()
-    session.refresh(lift)
+    session.flush()
     return lift.id
 
 
 def add_lift_to_workout(session: Session, workout_id: int, lift_id: int) -> int:
     """Insert a WorkoutLift and return its id."""
-    from backend.models import WorkoutLift
-
     wl = WorkoutLift(workout_id=workout_id, lift_id=lift_id)
     session.add(wl)
-    session.commit()
-    session.refresh(wl)
+    session.flush()
     return wl.id
 
 
@@ -76,8 +51,6 @@ def add_set(
     set_number: int = 1,
 ) -> None:
     """Insert a WorkoutSet."""
-    from backend.models import WorkoutSet
-
     ws = WorkoutSet(
         workout_lift_id=workout_lift_id,
         set_number=set_number,
@@ -85,7 +58,32 @@ def add_set(
         weight=weight,
     )
     session.add(ws)
-    session.commit()
+    session.flush()
+
+
+def add_workouts(
+    session: Session, *workouts: tuple[date, dict[int, tuple[int, float]]]
+) -> list[int]:
+    """
+    Insert workouts given as (date, {lift_id: (reps, weight)}) in one flush and return
+    their ids. Each lift gets a single set.
+    """
+    rows = [
+        Workout(
+            date=d,
+            workout_lifts=[
+                WorkoutLift(
+                    lift_id=lift_id,
+                    sets=[WorkoutSet(set_number=1, reps=reps, weight=weight)],
+                )
+                for lift_id, (reps, weight) in lift_sets.items()
+            ],
+        )
+        for d, lift_sets in workouts
+    ]
+    session.add_all(rows)
+    session.flush()
+    return [w.id for w in rows]
 
 
 # ---------------------------------------------------------------------------
@@ -159,16 +157,12 @@ def test_endurance_index_increases_with_volume(session: Session):
     w1 = make_workout(session, date(2025, 1, 1))
     wl1 = add_lift_to_workout(session, w1, lift)
     # volume = 3 * 10 * 50 = 1500
-    add_set(session, wl1, reps=10, weight=50.0, set_number=1)
-    add_set(session, wl1, reps=10, weight=50.0, set_number=2)
-    add_set(session, wl1, reps=10, weight=50.0, set_number=3)
+    add_sets(session, wl1, [(10, 50.0)] * 3)
 
     w2 = make_workout(session, date(2025, 1, 8))
     wl2 = add_lift_to_workout(session, w2, lift)
     # volume = 3 * 12 * 55 = 1980
-    add_set(session, wl2, reps=12, weight=55.0, set_number=1)
-    add_set(session, wl2, reps=12, weight=55.0, set_number=2)
-    add_set(session, wl2, reps=12, weight=55.0, set_number=3)
+    add_sets(session, wl2, [(12, 55.0)] * 3)
 
     result = calculate_workout_indexes(w2, session)
 
@@ -247,13 +241,13 @@ def test_get_all_workout_indexes_ordered_by_date(session: Session):
     """get_all_workout_indexes returns results ordered by date ascending."""
     lift = make_lift(session, "Press")
 
-    w3 = make_workout(session, date(2025, 3, 1))
-    w1 = make_workout(session, date(2025, 1, 1))
-    w2 = make_workout(session, date(2025, 2, 1))
-
-    for wid in (w1, w2, w3):
-        wl = add_lift_to_workout(session, wid, lift)
-        add_set(session, wl, reps=5, weight=100.0)
+    # Inserted out of date order
+    add_workouts(
+        session,
+        (date(2025, 3, 1), {lift: (5, 100.0)}),
+        (date(2025, 1, 1), {lift: (5, 100.0)}),
+        (date(2025, 2, 1), {lift: (5, 100.0)}),
+    )
 
     results = get_all_workout_indexes(session)
 
@@ -273,22 +267,15 @@ def test_get_lift_index_history_only_includes_that_lift(session: Session):
     lift_a = make_lift(session, "Bench")
     lift_b = make_lift(session, "Fly")
 
-    # w1: both lifts present
-    w1 = make_workout(session, date(2025, 1, 1))
-    wl1a = add_lift_to_workout(session, w1, lift_a)
-    add_set(session, wl1a, reps=5, weight=100.0)
-    wl1b = add_lift_to_workout(session, w1, lift_b)
-    add_set(session, wl1b, reps=12, weight=30.0)
-
-    # w2: only lift_b
-    w2 = make_workout(session, date(2025, 1, 8))
-    wl2b = add_lift_to_workout(session, w2, lift_b)
-    add_set(session, wl2b, reps=12, weight=35.0)
-
-    # w3: only lift_a with higher weight
-    w3 = make_workout(session, date(2025, 1, 15))
-    wl3a = add_lift_to_workout(session, w3, lift_a)
-    add_set(session, wl3a, reps=5, weight=110.0)
+    w1, w2, w3 = add_workouts(
+        session,
+        # w1: both lifts present
+        (date(2025, 1, 1), {lift_a: (5, 100.0), lift_b: (12, 30.0)}),
+        # w2: only lift_b
+        (date(2025, 1, 8), {lift_b: (12, 35.0)}),
+        # w3: only lift_a with higher weight
+        (date(2025, 1, 15), {lift_a: (5, 110.0)}),
+    )
 
     history_a = get_lift_index_history(lift_a, session)
     history_b = get_lift_index_history(lift_b, session)
@@ -308,3 +295,87 @@ def test_get_lift_index_history_only_includes_that_lift(session: Session):
     workout_ids_b = {r.workout_id for r in history_b}
     assert w2 in workout_ids_b
     assert w3 not in workout_ids_b
+
+
+def _cached_workout_ids(session: Session) -> set[int]:
+    return set(session.exec(select(WorkoutIndexesCache.workout_id)).all())
+
+
+def test_refresh_cache_serves_get_all_workout_indexes(session: Session):
+    """Refreshed cache rows are what get_all_workout_indexes returns."""
+    lift = make_lift(session, "Squat")
+    w1 = make_workout(session, date(2025, 1, 1))
+    add_set(session, add_lift_to_workout(session, w1, lift), reps=5, weight=100.0)
+    w2 = make_workout(session, date(2025, 1, 8))
+    add_set(session, add_lift_to_workout(session, w2, lift), reps=5, weight=120.0)
+
+    refresh_workout_indexes_cache(session)
+    session.commit()
+    assert _cached_workout_ids(session) == {w1, w2}
+
+    # Edit the cached value directly to prove reads don't recalculate
+    cached = session.get(WorkoutIndexesCache, w2)
+    cached.strength_index = 9.0
+    session.add(cached)
+    session.commit()
+
+    results = get_all_workout_indexes(session)
+    assert [r.workout_id for r in results] == [w1, w2]
+    assert results[1].strength_index == pytest.approx(9.0)
+
+
+def test_cache_invalidation_follows_baseline(session: Session):
+    """A set change in a lift's baseline invalidates every workout with that lift."""
+    lift = make_lift(session, "Bench")
+    other_lift = make_lift(session, "Row")
+
+    w1 = make_workout(session, date(2025, 1, 1))
+    wl1 = add_lift_to_workout(session, w1, lift)
+    add_set(session, wl1, reps=5, weight=100.0)
+    w2 = make_workout(session, date(2025, 1, 8))
+    wl2 = add_lift_to_workout(session, w2, lift)
+    add_set(session, wl2, reps=5, weight=110.0)
+    w3 = make_workout(session, date(2025, 1, 15))
+    add_set(session, add_lift_to_workout(session, w3, other_lift), reps=5, weight=50.0)
+
+    refresh_workout_indexes_cache(session)
+    session.commit()
+
+    # Not the baseline: only its own workout is invalidated
+    add_set(session, wl2, reps=5, weight=115.0, set_number=2)
+    assert _cached_workout_ids(session) == {w1, w3}
+    refresh_workout_indexes_cache(session)
+    session.commit()
+
+    # The baseline: every workout with the lift is invalidated
+    add_set(session, wl1, reps=5, weight=50.0, set_number=2)
+    assert _cached_workout_ids(session) == {w3}
+    refresh_workout_indexes_cache(session)
+    session.commit()
+
+    assert get_all_workout_indexes(session)[1].strength_index == pytest.approx(1.15)
+
+
+def test_refresh_cache_only_computes_baselines_of_missing_workouts(session: Session, monkeypatch):
+    """Refreshing one stale workout looks up baselines for its lifts, not every lift."""
+    squat = make_lift(session, "Squat")
+    row = make_lift(session, "Row")
+    w1 = make_workout(session, date(2025, 1, 1))
+    add_set(session, add_lift_to_workout(session, w1, squat), reps=5, weight=100.0)
+    w2 = make_workout(session, date(2025, 1, 8))
+    add_set(session, add_lift_to_workout(session, w2, row), reps=5, weight=60.0)
+    refresh_workout_indexes_cache(session)
+
+    session.exec(delete(WorkoutIndexesCache).where(WorkoutIndexesCache.workout_id == w2))
+    requested = []
+    get_baselines = indexes._get_baselines
+
+    def recording_get_baselines(session, lift_ids=None):
+        requested.append(lift_ids)
+        return get_baselines(session, lift_ids)
+
+    monkeypatch.setattr(indexes, "_get_baselines", recording_get_baselines)
+    refresh_workout_indexes_cache(session)
+
+    assert requested == [[row]]
+    assert session.get(WorkoutIndexesCache, w2).strength_index == pytest.approx(1.0)
@@ -1,31 +1,23 @@
+from datetime import date
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
-from backend.database import get_session
-from backend.models import MuscleGroup
+from backend.models import MuscleGroup, Workout, WorkoutLift, WorkoutSet
 from backend.routers.lifts import router
 
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    from fastapi import FastAPI
-
-    test_app = FastAPI()
-    test_app.include_router(router, prefix="/api/lifts")
-    test_app.dependency_overrides[get_session] = lambda: session
-    return TestClient(test_app)
+ROUTER_MOUNT = (router, "/api/lifts")
 
 
 def make_muscle_groups(session: Session, *names: str) -> list[int]:
     """Create MuscleGroup records and return their IDs."""
-    ids = []
-    for name in names:
-        mg = MuscleGroup(name=name)
-        session.add(mg)
-        session.commit()
-        session.refresh(mg)
-        ids.append(mg.id)
+    groups = [MuscleGroup(name=name) for name in names]
+    session.add_all(groups)
+    session.flush()
+    ids = [mg.id for mg in groups]
+    # Committed, so a route that rolls back on a constraint error keeps them
+    session.commit()
     return ids
 
 
@@ -67,6 +59,16 @@ def test_create_lift_invalid_muscle_group(client: TestClient):
     assert response.status_code == 400
 
 
+def test_create_lift_reports_every_missing_muscle_group(session: Session, client: TestClient):
+    (legs_id,) = make_muscle_groups(session, "Legs")
+    response = client.post(
+        "/api/lifts/",
+        json={"name": "Squat", "muscle_group_ids": [999, legs_id, 998]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Muscle group ids do not exist: [998, 999]"
+
+
 def test_create_lift_duplicate_name(session: Session, client: TestClient):
     make_muscle_groups(session, "Legs")
     client.post("/api/lifts/", json={"name": "Squat", "muscle_group_ids": []})
@@ -76,6 +78,15 @@ def test_create_lift_duplicate_name(session: Session, client: TestClient):
     assert response.json()["detail"] == "Name already exists"
 
 
+def test_create_lift_repeated_muscle_group_id(session: Session, client: TestClient):
+    (chest_id,) = make_muscle_groups(session, "Chest")
+    response = client.post(
+        "/api/lifts/", json={"name": "Bench Press", "muscle_group_ids": [chest_id, chest_id]}
+    )
+    assert response.status_code == 201
+    assert response.json()["muscle_group_ids"] == [chest_id]
+
+
 # ---------------------------------------------------------------------------
 # GET / — after data exists
 # ---------------------------------------------------------------------------
@@ -132,9 +143,44 @@ def test_patch_lift_muscle_group_ids(session: Session, client: TestClient):
     assert chest_id not in data["muscle_group_ids"]
 
 
-def test_patch_lift_not_found(client: TestClient):
-    response = client.patch("/api/lifts/9999", json={"name": "Ghost"})
-    assert response.status_code == 404
+def test_patch_lift_muscle_group_ids_twice(session: Session, client: TestClient):
+    chest_id, back_id = make_muscle_groups(session, "Chest", "Back")
+    lift_id = client.post("/api/lifts/", json={"name": "Dip", "muscle_group_ids": []}).json()["id"]
+
+    client.patch(f"/api/lifts/{lift_id}", json={"muscle_group_ids": [back_id]})
+    response = client.patch(f"/api/lifts/{lift_id}", json={"muscle_group_ids": [chest_id, back_id]})
+    assert response.json()["muscle_group_ids"] == [chest_id, back_id]
+
+
+def test_patch_lift_repeated_muscle_group_id(session: Session, client: TestClient):
+    chest_id, back_id = make_muscle_groups(session, "Chest", "Back")
+    lift_id = client.post(
+        "/api/lifts/", json={"name": "Bench Press", "muscle_group_ids": [chest_id]}
+    ).json()["id"]
+
+    response = client.patch(
+        f"/api/lifts/{lift_id}", json={"muscle_group_ids": [back_id, chest_id, back_id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["muscle_group_ids"] == [chest_id, back_id]
+
+
+def test_patch_lift_invalid_muscle_group_changes_nothing(session: Session, client: TestClient):
+    (chest_id,) = make_muscle_groups(session, "Chest")
+    create_resp = client.post(
+        "/api/lifts/",
+        json={"name": "Bench Press", "muscle_group_ids": [chest_id]},
+    )
+    lift_id = create_resp.json()["id"]
+
+    response = client.patch(
+        f"/api/lifts/{lift_id}",
+        json={"name": "Incline Press", "muscle_group_ids": [999]},
+    )
+    assert response.status_code == 400
+
+    lifts = client.get("/api/lifts/").json()
+    assert lifts == [{"id": lift_id, "name": "Bench Press", "muscle_group_ids": [chest_id]}]
 
 
 # ---------------------------------------------------------------------------
@@ -155,6 +201,61 @@ def test_delete_lift(session: Session, client: TestClient):
     assert list_after.json() == []
 
 
-def test_delete_lift_not_found(client: TestClient):
-    response = client.delete("/api/lifts/9999")
+def test_delete_lift_with_history_is_rejected(session: Session, client: TestClient):
+    lift_id = client.post("/api/lifts/", json={"name": "Curl", "muscle_group_ids": []}).json()["id"]
+    workout_lift = WorkoutLift(lift_id=lift_id)
+    workout_lift.sets = [WorkoutSet(set_number=1, reps=10, weight=20.0)]
+    session.add(Workout(date=date(2025, 1, 1), workout_lifts=[workout_lift]))
+    session.flush()
+
+    response = client.delete(f"/api/lifts/{lift_id}")
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Lift has workout history"}
+    assert [lift["id"] for lift in client.get("/api/lifts/").json()] == [lift_id]
+    assert len(session.exec(select(WorkoutLift)).all()) == 1
+    assert len(session.exec(select(WorkoutSet)).all()) == 1
+
+
+# ---------------------------------------------------------------------------
+# GET /{lift_id}/last-sets
+# ---------------------------------------------------------------------------
+
+
+def test_last_sets_from_most_recent_workout(session: Session, client: TestClient):
+    lift_id = client.post("/api/lifts/", json={"name": "Row", "muscle_group_ids": []}).json()["id"]
+    assert client.get(f"/api/lifts/{lift_id}/last-sets").json() == []
+
+    for workout_date, weight in [(date(2025, 1, 8), 60.0), (date(2025, 1, 1), 50.0)]:
+        workout = Workout(date=workout_date)
+        session.add(workout)
+        session.commit()
+        wl = WorkoutLift(workout_id=workout.id, lift_id=lift_id)
+        session.add(wl)
+        session.commit()
+        session.add(WorkoutSet(workout_lift_id=wl.id, set_number=2, reps=6, weight=weight))
+        session.add(WorkoutSet(workout_lift_id=wl.id, set_number=1, reps=8, weight=weight))
+        session.commit()
+
+    response = client.get(f"/api/lifts/{lift_id}/last-sets")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"set_number": 1, "reps": 8, "weight": 60.0},
+        {"set_number": 2, "reps": 6, "weight": 60.0},
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Unknown ids
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body"),
+    [
+        pytest.param("PATCH", "/api/lifts/9999", {"name": "Ghost"}, id="patch"),
+        pytest.param("DELETE", "/api/lifts/9999", None, id="delete"),
+    ],
+)
+def test_not_found(client: TestClient, method: str, path: str, body: dict | None):
+    response = client.request(method, path, json=body)
     assert response.status_code == 404
@@ -0,0 +1,26 @@
+import asyncio
+
+import backend.main as main
+
+
+def test_checkpoint_loop_survives_a_failed_checkpoint(monkeypatch):
+    calls = []
+
+    def checkpoint_wal():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise TimeoutError("write pool busy")
+
+    monkeypatch.setattr(main, "WAL_CHECKPOINT_INTERVAL", 0)
+    monkeypatch.setattr(main, "checkpoint_wal", checkpoint_wal)
+
+    async def run_until_second_checkpoint():
+        task = asyncio.create_task(main._checkpoint_wal_periodically())
+        while len(calls) < 2 and not task.done():
+            await asyncio.sleep(0)
+        task.cancel()
+        return task
+
+    task = asyncio.run(run_until_second_checkpoint())
+    assert task.cancelled()
+    assert len(calls) == 2
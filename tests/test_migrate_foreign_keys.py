@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import MetaData, create_engine, event, text
+from sqlmodel import SQLModel
+
+import backend.migrate_foreign_keys as migrate_foreign_keys
+from backend.database import outdated_foreign_key_tables
+from backend.models import WORKOUT_INDEXES_CACHE_TRIGGERS, _create_workout_indexes_cache_triggers
+
+
+@pytest.fixture(name="old_engine")
+def old_engine_fixture(tmp_path, monkeypatch):
+    """A file database whose foreign keys have no ON DELETE actions, as before they existed."""
+    db_path = tmp_path / "gaindalf.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"isolation_level": None})
+    # A scratch file, so don't wait for every DDL statement to reach the disk
+    event.listen(
+        engine,
+        "connect",
+        lambda dbapi_connection, _: dbapi_connection.execute("PRAGMA synchronous=OFF"),
+    )
+    old_metadata = MetaData()
+    for table in SQLModel.metadata.sorted_tables:
+        table.to_metadata(old_metadata)
+    for table in old_metadata.sorted_tables:
+        for constraint in table.foreign_key_constraints:
+            constraint.ondelete = None
+    old_metadata.create_all(engine)
+    with engine.connect() as conn:
+        _create_workout_indexes_cache_triggers(old_metadata, conn)
+
+    monkeypatch.setattr(migrate_foreign_keys, "DATABASE_PATH", str(db_path))
+    monkeypatch.setattr(migrate_foreign_keys, "write_engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_rebuild_keeps_every_row(old_engine):
+    with old_engine.connect() as conn:
+        # Foreign keys are off here, like on databases written before they were enforced
+        conn.execute(text("INSERT INTO lift (id, name) VALUES (2, 'Squat')"))
+        conn.execute(text("INSERT INTO workout (id, date, subtitle) VALUES (1, '2025-01-01', '')"))
+        conn.execute(
+            text(
+                "INSERT INTO workoutlift (id, workout_id, lift_id, display_order, notes) "
+                "VALUES (1, 1, 1, 0, ''), (2, 1, 2, 1, '')"  # lift 1 was deleted long ago
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO workoutset (id, workout_lift_id, set_number, reps, weight, done) "
+                "VALUES (1, 1, 1, 5, 100.0, 0), (2, 2, 1, 5, 120.0, 0)"
+            )
+        )
+
+    rebuilt = migrate_foreign_keys.rebuild_foreign_keys()
+
+    assert "workoutlift" in rebuilt
+    assert "workoutset" in rebuilt
+    with old_engine.connect() as conn:
+        assert outdated_foreign_key_tables(conn) == []
+        assert conn.execute(text("SELECT id FROM workoutlift ORDER BY id")).all() == [(1,), (2,)]
+        assert conn.execute(text("SELECT id FROM workoutset ORDER BY id")).all() == [(1,), (2,)]
+        trigger_count = conn.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+        ).scalar_one()
+        assert trigger_count == len(WORKOUT_INDEXES_CACHE_TRIGGERS)
+    assert migrate_foreign_keys.rebuild_foreign_keys() == []
+
+
+def test_backup_copies_database(old_engine, tmp_path):
+    with old_engine.connect() as conn:
+        conn.execute(text("INSERT INTO lift (id, name) VALUES (1, 'Squat')"))
+
+    dest = migrate_foreign_keys.backup()
+
+    assert dest.parent == tmp_path
+    backup_engine = create_engine(f"sqlite:///{dest}")
+    with backup_engine.connect() as conn:
+        assert conn.execute(text("SELECT name FROM lift")).all() == [("Squat",)]
+    backup_engine.dispose()
@@ -2,7 +2,9 @@
 
 from datetime import date
 
-from sqlmodel import Session, select
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel, delete, select
 
 from backend.models import (
     Lift,
@@ -14,22 +16,25 @@ from backend.models import (
     WorkoutSet,
 )
 
+ROUNDTRIP_CASES = [
+    (MuscleGroup, {"name": "Chest"}),
+    (Lift, {"name": "Bench Press"}),
+    (Workout, {"date": date(2025, 1, 15), "subtitle": "Heavy leg day"}),
+]
 
-def test_muscle_group_roundtrip(session: Session):
-    mg = MuscleGroup(name="Chest")
-    session.add(mg)
-    session.commit()
-    session.refresh(mg)
-    assert mg.id is not None
-    assert session.exec(select(MuscleGroup)).one().name == "Chest"
 
-
-def test_lift_roundtrip(session: Session):
-    lift = Lift(name="Bench Press")
-    session.add(lift)
+@pytest.mark.parametrize(
+    ("model", "fields"), ROUNDTRIP_CASES, ids=[m.__name__ for m, _ in ROUNDTRIP_CASES]
+)
+def test_roundtrip(session: Session, model: type[SQLModel], fields: dict):
+    obj = model(**fields)
+    session.add(obj)
     session.commit()
-    session.refresh(lift)
-    assert lift.id is not None
+    assert obj.id is not None
+
+    loaded = session.exec(select(model)).one()
+    for name, value in fields.items():
+        assert getattr(loaded, name) == value
 
 
 def test_lift_muscle_group_link(session: Session):
@@ -37,9 +42,7 @@ def test_lift_muscle_group_link(session: Session):
     lift = Lift(name="Bench Press")
     session.add(mg)
     session.add(lift)
-    session.commit()
-    session.refresh(mg)
-    session.refresh(lift)
+    session.flush()
 
     link = LiftMuscleGroup(lift_id=lift.id, muscle_group_id=mg.id)
     session.add(link)
@@ -50,28 +53,16 @@ def test_lift_muscle_group_link(session: Session):
     assert result.muscle_group_id == mg.id
 
 
-def test_workout_roundtrip(session: Session):
-    workout = Workout(date=date(2025, 1, 15), subtitle="Heavy leg day")
-    session.add(workout)
-    session.commit()
-    session.refresh(workout)
-    assert workout.id is not None
-    assert workout.subtitle == "Heavy leg day"
-
-
 def test_workout_lift_and_set_roundtrip(session: Session):
     mg = MuscleGroup(name="Legs")
     lift = Lift(name="Squat")
     workout = Workout(date=date(2025, 1, 15))
     session.add_all([mg, lift, workout])
-    session.commit()
-    session.refresh(lift)
-    session.refresh(workout)
+    session.flush()
 
     wl = WorkoutLift(workout_id=workout.id, lift_id=lift.id, display_order=0)
     session.add(wl)
-    session.commit()
-    session.refresh(wl)
+    session.flush()
 
     ws = WorkoutSet(workout_lift_id=wl.id, set_number=1, reps=5, weight=100.0)
     session.add(ws)
@@ -87,12 +78,36 @@ def test_muscle_group_conflict_roundtrip(session: Session):
     arms = MuscleGroup(name="Arms")
     shoulders = MuscleGroup(name="Shoulders")
     session.add_all([arms, shoulders])
-    session.commit()
-    session.refresh(arms)
-    session.refresh(shoulders)
+    session.flush()
 
     conflict = MuscleGroupConflict(muscle_group_a_id=arms.id, muscle_group_b_id=shoulders.id)
     session.add(conflict)
     session.commit()
-    session.refresh(conflict)
     assert conflict.id is not None
+
+
+def test_lift_with_history_cannot_be_deleted(session: Session):
+    lift = Lift(name="Squat")
+    workout_lift = WorkoutLift(lift=lift, sets=[WorkoutSet(set_number=1, reps=5)])
+    session.add(Workout(date=date(2025, 1, 15), workout_lifts=[workout_lift]))
+    session.flush()
+
+    # Only workouts cascade to their lifts and sets; a lift never takes history with it
+    with pytest.raises(IntegrityError):
+        session.exec(delete(Lift).where(Lift.id == lift.id))
+
+
+def test_query_indexes_created(session: Session):
+    rows = session.connection().exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    )
+    names = {name for (name,) in rows}
+    assert {
+        "ix_workout_date",
+        "ix_workoutlift_workout_id",
+        "ix_workoutlift_lift_id_workout_id",
+        "ix_workoutset_workout_lift_id_set_number",
+        "ix_liftmusclegroup_muscle_group_id",
+        "ix_musclegroupconflict_muscle_group_a_id",
+        "ix_musclegroupconflict_muscle_group_b_id",
+    } <= names
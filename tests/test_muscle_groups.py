@@ -1,20 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from backend.models import Lift, LiftMuscleGroup, MuscleGroupConflict
 from backend.routers.muscle_groups import router
 
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    from fastapi import FastAPI
-
-    from backend.database import get_session
-
-    test_app = FastAPI()
-    test_app.include_router(router, prefix="/api/muscle-groups")
-    test_app.dependency_overrides[get_session] = lambda: session
-    return TestClient(test_app)
+ROUTER_MOUNT = (router, "/api/muscle-groups")
 
 
 def test_list_empty(client: TestClient):
@@ -58,11 +49,6 @@ def test_rename(client: TestClient):
     assert body["id"] == muscle_group_id
 
 
-def test_rename_nonexistent(client: TestClient):
-    response = client.patch("/api/muscle-groups/99999", json={"id": 99999, "name": "Ghost"})
-    assert response.status_code == 404
-
-
 def test_delete(client: TestClient):
     create_response = client.post("/api/muscle-groups/", json={"id": 0, "name": "Triceps"})
     muscle_group_id = create_response.json()["id"]
@@ -70,6 +56,31 @@ def test_delete(client: TestClient):
     assert response.status_code == 204
 
 
-def test_delete_nonexistent(client: TestClient):
-    response = client.delete("/api/muscle-groups/99999")
+def test_delete_removes_links_and_conflicts(client: TestClient, session: Session):
+    chest_id = client.post("/api/muscle-groups/", json={"id": 0, "name": "Chest"}).json()["id"]
+    back_id = client.post("/api/muscle-groups/", json={"id": 0, "name": "Back"}).json()["id"]
+    lift = Lift(name="Bench Press")
+    session.add(lift)
+    session.flush()
+    session.add(LiftMuscleGroup(lift_id=lift.id, muscle_group_id=chest_id))
+    session.add(MuscleGroupConflict(muscle_group_a_id=chest_id, muscle_group_b_id=back_id))
+    session.commit()
+
+    response = client.delete(f"/api/muscle-groups/{chest_id}")
+    assert response.status_code == 204
+    assert session.exec(select(LiftMuscleGroup)).all() == []
+    assert session.exec(select(MuscleGroupConflict)).all() == []
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body"),
+    [
+        pytest.param(
+            "PATCH", "/api/muscle-groups/99999", {"id": 99999, "name": "Ghost"}, id="rename"
+        ),
+        pytest.param("DELETE", "/api/muscle-groups/99999", None, id="delete"),
+    ],
+)
+def test_not_found(client: TestClient, method: str, path: str, body: dict | None):
+    response = client.request(method, path, json=body)
     assert response.status_code == 404
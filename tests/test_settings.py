@@ -1,30 +1,17 @@
-import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from backend.models import MuscleGroup
 from backend.routers.settings import router
 
+ROUTER_MOUNT = (router, "/api/settings")
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    from fastapi import FastAPI
 
-    from backend.database import get_session
-
-    test_app = FastAPI()
-    test_app.include_router(router, prefix="/api/settings")
-    test_app.dependency_overrides[get_session] = lambda: session
-    return TestClient(test_app)
-
-
-def _add_muscle_group(session: Session, name: str) -> int:
-    from backend.models import MuscleGroup
-
-    mg = MuscleGroup(name=name)
-    session.add(mg)
-    session.commit()
-    session.refresh(mg)
-    return mg.id
+def _add_muscle_groups(session: Session, *names: str) -> list[int]:
+    groups = [MuscleGroup(name=name) for name in names]
+    session.add_all(groups)
+    session.flush()
+    return [mg.id for mg in groups]
 
 
 def test_list_empty(client: TestClient):
@@ -34,8 +21,7 @@ def test_list_empty(client: TestClient):
 
 
 def test_create_conflict(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
-    back_id = _add_muscle_group(session, "Back")
+    chest_id, back_id = _add_muscle_groups(session, "Chest", "Back")
 
     response = client.post(
         "/api/settings/conflicts",
@@ -51,7 +37,7 @@ def test_create_conflict(client: TestClient, session: Session):
 
 
 def test_create_conflict_nonexistent_muscle_group_a(client: TestClient, session: Session):
-    back_id = _add_muscle_group(session, "Back")
+    (back_id,) = _add_muscle_groups(session, "Back")
 
     response = client.post(
         "/api/settings/conflicts",
@@ -61,7 +47,7 @@ def test_create_conflict_nonexistent_muscle_group_a(client: TestClient, session:
 
 
 def test_create_conflict_nonexistent_muscle_group_b(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
+    (chest_id,) = _add_muscle_groups(session, "Chest")
 
     response = client.post(
         "/api/settings/conflicts",
@@ -71,7 +57,7 @@ def test_create_conflict_nonexistent_muscle_group_b(client: TestClient, session:
 
 
 def test_create_conflict_same_id(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
+    (chest_id,) = _add_muscle_groups(session, "Chest")
 
     response = client.post(
         "/api/settings/conflicts",
@@ -81,8 +67,7 @@ def test_create_conflict_same_id(client: TestClient, session: Session):
 
 
 def test_create_duplicate_conflict_same_direction(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
-    back_id = _add_muscle_group(session, "Back")
+    chest_id, back_id = _add_muscle_groups(session, "Chest", "Back")
 
     client.post(
         "/api/settings/conflicts",
@@ -97,8 +82,7 @@ def test_create_duplicate_conflict_same_direction(client: TestClient, session: S
 
 
 def test_create_duplicate_conflict_reversed_direction(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
-    back_id = _add_muscle_group(session, "Back")
+    chest_id, back_id = _add_muscle_groups(session, "Chest", "Back")
 
     client.post(
         "/api/settings/conflicts",
@@ -113,8 +97,7 @@ def test_create_duplicate_conflict_reversed_direction(client: TestClient, sessio
 
 
 def test_list_after_create(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
-    shoulders_id = _add_muscle_group(session, "Shoulders")
+    chest_id, shoulders_id = _add_muscle_groups(session, "Chest", "Shoulders")
 
     client.post(
         "/api/settings/conflicts",
@@ -130,8 +113,7 @@ def test_list_after_create(client: TestClient, session: Session):
 
 
 def test_delete_conflict(client: TestClient, session: Session):
-    chest_id = _add_muscle_group(session, "Chest")
-    back_id = _add_muscle_group(session, "Back")
+    chest_id, back_id = _add_muscle_groups(session, "Chest", "Back")
 
     create_response = client.post(
         "/api/settings/conflicts",
@@ -1,50 +1,35 @@
+from datetime import date
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, select
 
+from backend.models import Lift, Workout, WorkoutLift, WorkoutSet
 from backend.routers.workouts import router
 
-
-@pytest.fixture(name="session")
-def session_fixture():
-    """Override the conftest session fixture with StaticPool so that the
-    in-memory SQLite database is shared across all connections (including
-    those made from the anyio thread pool used by the TestClient)."""
-    import backend.models as _models  # noqa: F401 — register all tables
-
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    from fastapi import FastAPI
-
-    from backend.database import get_session
-
-    test_app = FastAPI()
-    test_app.include_router(router, prefix="/api/workouts")
-    test_app.dependency_overrides[get_session] = lambda: session
-    return TestClient(test_app)
+ROUTER_MOUNT = (router, "/api/workouts")
 
 
 def _create_lift(session: Session, name: str) -> int:
-    from backend.models import Lift
-
     lift = Lift(name=name)
     session.add(lift)
-    session.commit()
-    session.refresh(lift)
+    session.flush()
     return lift.id
 
 
+def _create_workout(session: Session, *lift_ids: int) -> tuple[int, list[int]]:
+    """Insert today's workout with the given lifts; return its id and the WorkoutLift ids."""
+    workout = Workout(date=date.today())
+    session.add(workout)
+    session.flush()
+    # Linked by id rather than through workout.workout_lifts, so deletes run the same way
+    # as for a workout loaded from the database by a route
+    workout_lifts = [WorkoutLift(workout_id=workout.id, lift_id=lift_id) for lift_id in lift_ids]
+    session.add_all(workout_lifts)
+    session.flush()
+    return workout.id, [wl.id for wl in workout_lifts]
+
+
 # ---------------------------------------------------------------------------
 # List
 # ---------------------------------------------------------------------------
@@ -66,7 +51,7 @@ def test_create(client: TestClient):
     assert response.status_code == 201
     body = response.json()
     assert isinstance(body["id"], int)
-    assert "date" in body
+    assert body["date"] == date.today().isoformat()
     assert body["subtitle"] == ""
     assert body["workout_lifts"] == []
 
@@ -95,11 +80,6 @@ def test_get_detail(client: TestClient):
     assert body["workout_lifts"] == []
 
 
-def test_get_nonexistent(client: TestClient):
-    response = client.get("/api/workouts/99999")
-    assert response.status_code == 404
-
-
 # ---------------------------------------------------------------------------
 # Patch subtitle
 # ---------------------------------------------------------------------------
@@ -115,11 +95,6 @@ def test_patch_subtitle(client: TestClient):
     assert body["id"] == workout_id
 
 
-def test_patch_nonexistent(client: TestClient):
-    response = client.patch("/api/workouts/99999", json={"subtitle": "Ghost"})
-    assert response.status_code == 404
-
-
 # ---------------------------------------------------------------------------
 # Add lift
 # ---------------------------------------------------------------------------
@@ -127,8 +102,7 @@ def test_patch_nonexistent(client: TestClient):
 
 def test_add_lift(client: TestClient, session: Session):
     lift_id = _create_lift(session, "Bench Press")
-    create_resp = client.post("/api/workouts/")
-    workout_id = create_resp.json()["id"]
+    workout_id, _ = _create_workout(session)
 
     add_resp = client.post(
         f"/api/workouts/{workout_id}/lifts",
@@ -167,6 +141,25 @@ def test_add_lift_invalid_workout_id(client: TestClient, session: Session):
     assert response.status_code == 404
 
 
+def test_previous_notes_from_most_recent_workout(client: TestClient, session: Session):
+    lift_id = _create_lift(session, "Squat")
+    older = Workout(date=date(2025, 1, 1))
+    newer = Workout(date=date(2025, 2, 1))
+    session.add_all([older, newer])
+    session.commit()
+    session.add_all(
+        [
+            WorkoutLift(workout_id=newer.id, lift_id=lift_id, notes="Felt strong"),
+            WorkoutLift(workout_id=older.id, lift_id=lift_id, notes="Knees caved"),
+        ]
+    )
+    session.commit()
+
+    workout_id = client.post("/api/workouts/").json()["id"]
+    add_resp = client.post(f"/api/workouts/{workout_id}/lifts", json={"lift_id": lift_id})
+    assert add_resp.json()["previous_notes"] == "Felt strong"
+
+
 # ---------------------------------------------------------------------------
 # Delete workout lift
 # ---------------------------------------------------------------------------
@@ -174,14 +167,7 @@ def test_add_lift_invalid_workout_id(client: TestClient, session: Session):
 
 def test_delete_workout_lift(client: TestClient, session: Session):
     lift_id = _create_lift(session, "Deadlift")
-    create_resp = client.post("/api/workouts/")
-    workout_id = create_resp.json()["id"]
-
-    add_resp = client.post(
-        f"/api/workouts/{workout_id}/lifts",
-        json={"lift_id": lift_id},
-    )
-    wl_id = add_resp.json()["id"]
+    workout_id, (wl_id,) = _create_workout(session, lift_id)
 
     del_resp = client.delete(f"/api/workouts/{workout_id}/lifts/{wl_id}")
     assert del_resp.status_code == 204
@@ -208,24 +194,10 @@ def test_delete_workout(client: TestClient):
 
 def test_delete_workout_cascades(client: TestClient, session: Session):
     """Deleting a workout removes its WorkoutLifts and WorkoutSets (no orphans)."""
-    from sqlmodel import select
-
-    from backend.models import WorkoutSet
-
     lift_id = _create_lift(session, "Overhead Press")
-    create_resp = client.post("/api/workouts/")
-    workout_id = create_resp.json()["id"]
-
-    add_resp = client.post(
-        f"/api/workouts/{workout_id}/lifts",
-        json={"lift_id": lift_id},
-    )
-    wl_id = add_resp.json()["id"]
-
-    # Add a WorkoutSet directly via the session
-    ws = WorkoutSet(workout_lift_id=wl_id, set_number=1, reps=5, weight=60.0)
-    session.add(ws)
-    session.commit()
+    workout_id, (wl_id,) = _create_workout(session, lift_id)
+    session.add(WorkoutSet(workout_lift_id=wl_id, set_number=1, reps=5, weight=60.0))
+    session.flush()
 
     # Delete the workout via the API
     del_resp = client.delete(f"/api/workouts/{workout_id}")
@@ -238,6 +210,19 @@ def test_delete_workout_cascades(client: TestClient, session: Session):
     assert remaining_sets == []
 
 
-def test_delete_nonexistent(client: TestClient):
-    response = client.delete("/api/workouts/99999")
+# ---------------------------------------------------------------------------
+# Unknown ids
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body"),
+    [
+        pytest.param("GET", "/api/workouts/99999", None, id="get"),
+        pytest.param("PATCH", "/api/workouts/99999", {"subtitle": "Ghost"}, id="patch"),
+        pytest.param("DELETE", "/api/workouts/99999", None, id="delete"),
+    ],
+)
+def test_not_found(client: TestClient, method: str, path: str, body: dict | None):
+    response = client.request(method, path, json=body)
     assert response.status_code == 404